@@ -0,0 +1,64 @@
+"""
+Configuration file caches.
+Single responsibility: skip redundant YAML parses and writes of config files.
+"""
+
+import hashlib
+import json
+import yaml
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+# Prefer the LibYAML C bindings; fall back to the pure-Python class
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+def config_digest(config: Dict[str, Any]) -> str:
+    """Stable content hash of a config dictionary."""
+    canonical = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def file_signature(path: Path, digest: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Identify a written config file by content digest and stat signature.
+    
+    The stat part means a hand-edited file never matches the signature
+    recorded when it was saved.
+    
+    Args:
+        path: Config file
+        digest: Digest of the config written to it
+        
+    Returns:
+        (digest, mtime_ns, size), or None if the file does not exist
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (digest, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=128)
+def load_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML file, cached on its stat signature.
+    
+    ``mtime_ns`` and ``size`` are only part of the cache key, so an edited
+    file misses the cache and is parsed again.
+    
+    Args:
+        path: Resolved path to the YAML file
+        mtime_ns: File modification time in nanoseconds
+        size: File size in bytes
+        
+    Returns:
+        Parsed YAML document (shared; callers must copy before mutating)
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
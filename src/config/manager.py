@@ -3,13 +3,21 @@ Configuration management.
 Single responsibility: load, validate, and manage configuration.
 """
 
+import copy
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 
+from .cache import load_yaml, config_digest, file_signature
 from ..utils.logger import get_logger
 
+# Prefer the LibYAML C bindings; fall back to the pure-Python class
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 
 logger = get_logger()
 
@@ -83,6 +91,8 @@ class ConfigManager:
         self.config: Dict[str, Any] = {}
         self.datasets: Dict[str, DatasetConfig] = {}
         self.comparisons: List[ComparisonConfig] = []
+        # output path -> file_signature() of the config this manager last saved there
+        self._saved_signatures: Dict[Path, Tuple[str, int, int]] = {}
     
     def load(self) -> Dict[str, Any]:
         """
@@ -100,8 +110,10 @@ class ConfigManager:
         
         logger.info("config.loading", file=str(self.config_path))
         
-        with open(self.config_path) as f:
-            self.config = yaml.safe_load(f)
+        stat = self.config_path.stat()
+        self.config = copy.deepcopy(
+            load_yaml(str(self.config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        )
         
         self._parse_datasets()
         self._parse_comparisons()
@@ -206,15 +218,34 @@ class ConfigManager:
         Args:
             path: Output path (uses original path if not specified)
         """
-        output_path = path or self.config_path
+        output_path = Path(path or self.config_path)
         
         logger.info("config.saving", file=str(output_path))
         
-        # Convert dataclasses back to dictionaries
-        config_dict = {
-            "datasets": {},
-            "comparisons": []
-        }
+        config_dict = self._to_dict()
+        
+        # Skip the YAML dump when the file already holds exactly this config
+        digest = config_digest(config_dict)
+        signature = file_signature(output_path, digest)
+        if signature is not None and self._saved_signatures.get(output_path) == signature:
+            logger.info("config.save_skipped", file=str(output_path), reason="unchanged")
+            return
+        
+        with open(output_path, 'w') as f:
+            yaml.dump(config_dict, f, Dumper=SafeDumper, default_flow_style=False)
+        
+        self._saved_signatures[output_path] = file_signature(output_path, digest)
+        
+        logger.info("config.saved", file=str(output_path))
+    
+    def _to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the parsed datasets and comparisons back to a config dictionary.
+        
+        Returns:
+            Configuration dictionary in the datasets.yaml layout
+        """
+        config_dict = {"datasets": {}, "comparisons": []}
         
         for name, dataset in self.datasets.items():
             config_dict["datasets"][name] = {
@@ -256,7 +287,4 @@ class ConfigManager:
                 "enable_smart_preview": comparison.enable_smart_preview
             })
         
-        with open(output_path, 'w') as f:
-            yaml.dump(config_dict, f, default_flow_style=False)
-        
-        logger.info("config.saved", file=str(output_path))
\ No newline at end of file
+        return config_dict
@@ -3,19 +3,151 @@ Data staging pipeline.
 Single responsibility: stage data efficiently to Parquet format.
 """
 
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import duckdb
 import pandas as pd
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..adapters.file_reader import UniversalFileReader
 from ..utils.logger import get_logger
-from ..utils.normalizers import normalize_column_name
+from ..utils.normalizers import NORMALIZER_SQL, normalize_column_name
 from ..config.manager import DatasetConfig
 
 
 logger = get_logger()
 
+# Bytes hashed from each end of a source file for the restage check
+_DIGEST_EDGE_BYTES = 1 << 20
+
+
+@lru_cache(maxsize=128)
+def _read_header(path: str, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """
+    Column names of a source file, read from its header only.
+    
+    ``mtime_ns`` and ``size`` only key the cache, so an edited file is
+    read again and the oldest versions are evicted.
+    """
+    file_path = Path(path)
+    suffix = file_path.suffix.lower()
+    if suffix in ['.xlsx', '.xls']:
+        # Read Excel header only
+        df = pd.read_excel(file_path, nrows=0)
+    elif suffix == '.csv':
+        # Read CSV header only 
+        df = pd.read_csv(file_path, nrows=0)
+    elif suffix == '.parquet':
+        # Read Parquet schema
+        df = pd.read_parquet(file_path, nrows=0)
+    else:
+        # Fallback for other formats
+        df = pd.read_csv(file_path, nrows=0)
+    return tuple(df.columns.tolist())
+
+
+def _file_digest(path: Path) -> str:
+    """
+    Hash a source file's size and its first and last MiB.
+    
+    Used to tell a touched-but-unchanged source (new mtime, same bytes)
+    from a real edit, so the former does not force a restage. Reads at
+    most 2 MiB however large the source is; a same-size edit confined to
+    the middle of a large file is not detected.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(size.to_bytes(8, 'little'))
+        digest.update(f.read(_DIGEST_EDGE_BYTES))
+        if size > _DIGEST_EDGE_BYTES:
+            f.seek(max(size - _DIGEST_EDGE_BYTES, _DIGEST_EDGE_BYTES))
+            digest.update(f.read(_DIGEST_EDGE_BYTES))
+    return digest.hexdigest()
+
+
+def _source_unchanged(metadata: Dict[str, Any], source_file: Path,
+                      source_stat: os.stat_result) -> bool:
+    """
+    Whether a source with a newer mtime still matches its stored size and hash.
+    
+    A touch, checkout or copy moves the mtime without changing the bytes.
+    """
+    stored_digest = metadata.get('source_digest')
+    return (
+        stored_digest is not None
+        and metadata.get('source_size') == source_stat.st_size
+        and _file_digest(source_file) == stored_digest
+    )
+
+
+def _plan_hash(config: DatasetConfig) -> str:
+    """
+    Hash the parts of a dataset config that shape the staged table.
+    
+    A staged copy built with different normalizers, converters or custom SQL
+    is stale even when the source file itself is unchanged.
+    """
+    plan = {
+        "normalizers": sorted((config.normalizers or {}).items()),
+        "converters": sorted((config.converters or {}).items()),
+        "custom_sql": config.custom_sql,
+    }
+    return hashlib.blake2b(json.dumps(plan, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+def _memo_key(source_file: Path, source_stat: os.stat_result, plan_hash: str) -> tuple:
+    """In-process identity of a source version and staging plan."""
+    return (os.path.abspath(source_file), source_stat.st_mtime_ns, source_stat.st_size, plan_hash)
+
+
+def _read_metadata(metadata_path: Path) -> Dict[str, Any]:
+    """Load a staging ``.meta`` file (JSON, parsed with orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(metadata_path.read_bytes())
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+
+def _write_metadata_file(metadata_path: Path, metadata: Dict[str, Any]) -> None:
+    """Write a staging ``.meta`` file as indented JSON."""
+    if ORJSON_AVAILABLE:
+        metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+
+class FileMetadataStore:
+    """
+    Metadata kept as ``<dataset>.meta`` JSON files in the staging directory.
+    """
+    
+    def __init__(self, staging_dir: Path):
+        self.staging_dir = Path(staging_dir)
+    
+    def _path(self, dataset_name: str) -> Path:
+        return self.staging_dir / f"{dataset_name}.meta"
+    
+    def load(self, dataset_name: str) -> Optional[Dict[str, Any]]:
+        try:
+            return _read_metadata(self._path(dataset_name))
+        except FileNotFoundError:
+            return None
+    
+    def save(self, dataset_name: str, metadata: Dict[str, Any]) -> None:
+        _write_metadata_file(self._path(dataset_name), metadata)
+
 
 class DataStager:
     """
@@ -34,6 +166,13 @@ class DataStager:
         self.staging_dir = Path(staging_dir or "data/staging")
         self.staging_dir.mkdir(parents=True, exist_ok=True)
         self.chunk_size = chunk_size
+        self.metadata_store = FileMetadataStore(self.staging_dir)
+        # dataset name -> (source path, mtime_ns, size, plan hash) last known
+        # to match the stored metadata in this process
+        self._meta_memo: Dict[str, tuple] = {}
+        # dataset name -> metadata with a refreshed source_mtime, queued by
+        # _should_restage and saved by _record_touched_sources
+        self._touched_sources: Dict[str, Dict[str, Any]] = {}
         self.file_reader = UniversalFileReader()
     
     def stage_dataset(self, con: duckdb.DuckDBPyConnection,
@@ -55,6 +194,57 @@ class DataStager:
         # Check if restaging is needed (schema drift, file changes, or force)
         needs_restage = force_restage or self._should_restage(staging_path, config.path, config)
         
+        self._record_touched_sources()
+        
+        return self._stage(con, config, staging_path, needs_restage)
+    
+    def stage_datasets(self, con: duckdb.DuckDBPyConnection,
+                       configs: List[DatasetConfig],
+                       force_restage: bool = False,
+                       max_workers: int = 8) -> List[str]:
+        """
+        Stage several datasets, checking their sources concurrently.
+        
+        The restage checks (stat, header read, content hash) are file I/O and
+        run on a thread pool; the DuckDB work then runs in order on ``con``.
+        
+        Args:
+            con: DuckDB connection
+            configs: Dataset configurations
+            force_restage: Force restaging even if files exist
+            max_workers: Threads used for the restage checks
+            
+        Returns:
+            Names of staged tables in DuckDB, in ``configs`` order
+        """
+        staging_paths = [self.staging_dir / f"{config.name}.parquet" for config in configs]
+        
+        if force_restage:
+            verdicts = [True] * len(configs)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                verdicts = list(pool.map(
+                    lambda args: self._should_restage(args[0], args[1].path, args[1]),
+                    zip(staging_paths, configs)
+                ))
+            self._record_touched_sources()
+        
+        logger.info("stager.staging_datasets",
+                   count=len(configs),
+                   restage=sum(verdicts))
+        
+        return [
+            self._stage(con, config, staging_path, needs_restage)
+            for config, staging_path, needs_restage in zip(configs, staging_paths, verdicts)
+        ]
+    
+    def _stage(self, con: duckdb.DuckDBPyConnection,
+               config: DatasetConfig,
+               staging_path: Path,
+               needs_restage: bool) -> str:
+        """
+        Load a dataset into DuckDB, reusing its Parquet copy unless restaging.
+        """
         # Check if already staged and no restaging needed
         if staging_path.exists() and not needs_restage:
             logger.info("stager.using_existing",
@@ -124,7 +314,7 @@ class DataStager:
                    path=str(staging_path))
         
         return config.name
-    
+
     def _stage_standard(self, con: duckdb.DuckDBPyConnection,
                        config: DatasetConfig,
                        file_path: Path,
@@ -202,62 +392,62 @@ class DataStager:
                     dataset=config.name,
                     count=len(config.normalizers))
         
-        for column, normalizer in config.normalizers.items():
-            if normalizer == "strip_hierarchy":
-                # Use CREATE TABLE AS SELECT for robust, permanent transformation
-                # Strips everything up to and including the last colon, then trims whitespace
-                temp_table = f"{config.name}_temp"
-                
-                # Get all column names for SELECT *
-                columns_result = con.execute(f"""
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_name = '{config.name}'
-                """).fetchall()
-                
-                all_columns = [col[0] for col in columns_result]
-                
-                # Build SELECT with transformation for target column
-                select_parts = []
-                for col in all_columns:
-                    if col == normalize_column_name(column):
-                        # Apply strip_hierarchy transformation to this column
-                        select_parts.append(f"""
-                            CASE 
-                                WHEN "{col}" IS NULL THEN NULL
-                                WHEN POSITION(':' IN "{col}") = 0 THEN "{col}"
-                                ELSE TRIM(REGEXP_REPLACE(
-                                    REGEXP_REPLACE("{col}", '^.*: *', ''),
-                                    '^\\s+|\\s+$', '', 'g'
-                                ))
-                            END AS "{col}"
-                        """)
-                    else:
-                        # Keep other columns unchanged
-                        select_parts.append(f'"{col}"')
-                
-                # Execute transformation sequence
-                con.execute(f"""
-                    CREATE TABLE {temp_table} AS
-                    SELECT {', '.join(select_parts)}
-                    FROM {config.name}
-                """)
-                
-                # Drop the original table/view safely (same logic as _normalize_columns)
+        # Resolve every normalizer with a SQL form up front, keyed by the
+        # staged column name, so the table is rewritten once for all of them
+        sql_exprs = {
+            normalize_column_name(column): NORMALIZER_SQL[normalizer]
+            for column, normalizer in config.normalizers.items()
+            if normalizer in NORMALIZER_SQL
+        }
+        if sql_exprs:
+            # Use CREATE TABLE AS SELECT for robust, permanent transformation
+            # with each normalizer's SQL form (e.g. strip_hierarchy keeps the
+            # text after the last colon, trimmed)
+            temp_table = f"{config.name}_temp"
+            
+            # Get all column names for SELECT *
+            columns_result = con.execute(f"""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name = '{config.name}'
+            """).fetchall()
+            
+            all_columns = [col[0] for col in columns_result]
+            
+            # Build SELECT with transformation for target columns
+            select_parts = []
+            for col in all_columns:
+                if col in sql_exprs:
+                    # Apply the normalizer's SQL expression to this column
+                    expr = sql_exprs[col].format(col=f'"{col}"')
+                    select_parts.append(f'{expr} AS "{col}"')
+                else:
+                    # Keep other columns unchanged
+                    select_parts.append(f'"{col}"')
+            
+            # Execute transformation sequence
+            con.execute(f"""
+                CREATE TABLE {temp_table} AS
+                SELECT {', '.join(select_parts)}
+                FROM {config.name}
+            """)
+            
+            # Drop the original table/view safely (same logic as _normalize_columns)
+            try:
+                # Try dropping as table first (most common case)
+                con.execute(f"DROP TABLE IF EXISTS {config.name}")
+            except:
+                # If that fails, try dropping as view
                 try:
-                    # Try dropping as table first (most common case)
-                    con.execute(f"DROP TABLE IF EXISTS {config.name}")
+                    con.execute(f"DROP VIEW IF EXISTS {config.name}")
                 except:
-                    # If that fails, try dropping as view
-                    try:
-                        con.execute(f"DROP VIEW IF EXISTS {config.name}")
-                    except:
-                        # If both fail, it doesn't exist (which is fine)
-                        pass
-                
-                con.execute(f"ALTER TABLE {temp_table} RENAME TO {config.name}")
-                
-            elif normalizer == "unicode_clean":
+                    # If both fail, it doesn't exist (which is fine)
+                    pass
+            
+            con.execute(f"ALTER TABLE {temp_table} RENAME TO {config.name}")
+        
+        for column, normalizer in config.normalizers.items():
+            if normalizer == "unicode_clean":
                 # For simplicity, using basic cleaning
                 con.execute(f"""
                     UPDATE {config.name}
@@ -401,90 +591,65 @@ class DataStager:
         
         return staging_path
     
-    def _read_source_columns(self, source_path: str) -> List[str]:
+    def _read_source_columns(self, source_path: str,
+                             source_stat: Optional[os.stat_result] = None) -> List[str]:
         """
         Read column names from source file for schema drift detection.
         
         Args:
             source_path: Path to source file
+            source_stat: Result of stat() on the source, if the caller has it
             
         Returns:
             List of column names in source file
         """
         file_path = Path(source_path)
-        suffix = file_path.suffix.lower()
         
+        # Both the restage check and the metadata writer ask for the same
+        # header; only read it again once the file has changed
         try:
-            if suffix in ['.xlsx', '.xls']:
-                # Read Excel header only
-                df = pd.read_excel(file_path, nrows=0)
-                return df.columns.tolist()
-            elif suffix == '.csv':
-                # Read CSV header only 
-                df = pd.read_csv(file_path, nrows=0)
-                return df.columns.tolist()
-            elif suffix == '.parquet':
-                # Read Parquet schema
-                df = pd.read_parquet(file_path, nrows=0)
-                return df.columns.tolist()
-            else:
-                # Fallback for other formats
-                df = pd.read_csv(file_path, nrows=0)
-                return df.columns.tolist()
+            st = source_stat or file_path.stat()
+            return list(_read_header(os.path.abspath(file_path), st.st_mtime_ns, st.st_size))
         except Exception as e:
             logger.warning("stager.schema_read_failed",
                          path=source_path,
                          error=str(e))
             return []
     
-    def _should_restage(self, staging_path: Path, source_path: str, config: DatasetConfig) -> bool:
+    def _should_restage(self, staging_path: Path, source_path: str, config: DatasetConfig,
+                        source_stat: Optional[os.stat_result] = None) -> bool:
         """
         Determine if restaging is needed due to schema drift or file changes.
         
+        Only reads the metadata store. A source whose mtime moved without its
+        content changing is queued for ``_record_touched_sources``.
+        
         Args:
             staging_path: Path to staged parquet file
             source_path: Path to source file
             config: Dataset configuration
+            source_stat: Result of stat() on the source, if the caller has it
             
         Returns:
             True if restaging is needed, False otherwise
         """
-        metadata_path = staging_path.with_suffix('.meta')
-        
-        # If metadata doesn't exist, assume we need to restage
-        if not metadata_path.exists():
-            return True
-            
         try:
-            # Read stored metadata
-            with open(metadata_path, 'r') as f:
-                import json
-                metadata = json.load(f)
-            
-            # Get current source file info
+            # Get current source file info, stat'ing the source only once
             source_file = Path(source_path)
-            current_mtime = source_file.stat().st_mtime
-            current_columns = self._read_source_columns(source_path)
+            if source_stat is None:
+                source_stat = source_file.stat()
+            plan_hash = _plan_hash(config)
             
-            # Check for file modification
-            stored_mtime = metadata.get('source_mtime', 0)
-            if current_mtime > stored_mtime:
-                logger.info("stager.restage_needed.file_modified",
-                           dataset=config.name,
-                           current_mtime=current_mtime,
-                           stored_mtime=stored_mtime)
-                return True
+            # Already validated (or staged) in this process for this exact
+            # source version and plan: skip the metadata read entirely
+            memo_key = _memo_key(source_file, source_stat, plan_hash)
+            if self._meta_memo.get(config.name) == memo_key:
+                return False
             
-            # Check for schema drift
-            stored_columns = metadata.get('source_columns', [])
-            if set(current_columns) != set(stored_columns):
-                logger.info("stager.restage_needed.schema_drift",
-                           dataset=config.name,
-                           current_columns=current_columns,
-                           stored_columns=stored_columns)
-                return True
-                
-            return False
+            needs_restage = self._metadata_stale(config, source_file, source_stat, plan_hash)
+            if not needs_restage:
+                self._meta_memo[config.name] = memo_key
+            return needs_restage
             
         except Exception as e:
             logger.warning("stager.metadata_check_failed",
@@ -493,36 +658,90 @@ class DataStager:
             # If we can't read metadata, assume we need to restage
             return True
     
+    def _metadata_stale(self, config: DatasetConfig, source_file: Path,
+                        source_stat: os.stat_result, plan_hash: str) -> bool:
+        """
+        Compare a source and staging plan against the stored metadata.
+        
+        Returns:
+            True if the metadata is missing or the plan, content or columns changed
+        """
+        # Read stored metadata; if it doesn't exist, we need to restage
+        metadata = self.metadata_store.load(config.name)
+        if metadata is None:
+            return True
+        
+        # Check for a changed staging plan (normalizers, converters, SQL);
+        # metadata written before plans were recorded counts as changed
+        if metadata.get('plan_hash') != plan_hash:
+            logger.info("stager.restage_needed.plan_changed", dataset=config.name)
+            return True
+        
+        # Check for file modification beyond a touch
+        touched = source_stat.st_mtime > metadata.get('source_mtime', 0)
+        if touched and not _source_unchanged(metadata, source_file, source_stat):
+            logger.info("stager.restage_needed.file_modified",
+                       dataset=config.name,
+                       current_mtime=source_stat.st_mtime,
+                       stored_mtime=metadata.get('source_mtime', 0))
+            return True
+        
+        # Check for schema drift
+        current_columns = self._read_source_columns(str(source_file), source_stat)
+        stored_columns = metadata.get('source_columns', [])
+        if set(current_columns) != set(stored_columns):
+            logger.info("stager.restage_needed.schema_drift",
+                       dataset=config.name,
+                       current_columns=current_columns,
+                       stored_columns=stored_columns)
+            return True
+        
+        if touched:
+            self._touched_sources[config.name] = {**metadata, 'source_mtime': source_stat.st_mtime}
+        return False
+    
+    def _record_touched_sources(self) -> None:
+        """
+        Save the new mtime of sources found touched but unchanged.
+        
+        Called on the staging thread after the restage checks, so the metadata
+        store is never written from check worker threads; later checks then
+        skip the content hash.
+        """
+        while self._touched_sources:
+            name, metadata = self._touched_sources.popitem()
+            self.metadata_store.save(name, metadata)
+    
     def _write_metadata(self, staging_path: Path, source_path: str, config: DatasetConfig):
         """
-        Write metadata file for schema drift detection.
+        Write metadata for schema drift detection.
         
         Args:
             staging_path: Path to staged parquet file
             source_path: Path to source file  
             config: Dataset configuration
         """
-        metadata_path = staging_path.with_suffix('.meta')
-        
         try:
             source_file = Path(source_path)
-            current_mtime = source_file.stat().st_mtime
-            current_columns = self._read_source_columns(source_path)
+            source_stat = source_file.stat()
+            current_columns = self._read_source_columns(source_path, source_stat)
             
+            plan_hash = _plan_hash(config)
             metadata = {
                 'source_columns': current_columns,
-                'source_mtime': current_mtime,
+                'source_mtime': source_stat.st_mtime,
+                'source_size': source_stat.st_size,
+                'source_digest': _file_digest(source_file),
+                'plan_hash': plan_hash,
                 'dataset_name': config.name,
                 'created_at': pd.Timestamp.now().isoformat()
             }
             
-            with open(metadata_path, 'w') as f:
-                import json
-                json.dump(metadata, f, indent=2)
+            self.metadata_store.save(config.name, metadata)
+            self._meta_memo[config.name] = _memo_key(source_file, source_stat, plan_hash)
                 
             logger.debug("stager.metadata_written",
-                        dataset=config.name,
-                        path=str(metadata_path))
+                        dataset=config.name)
                         
         except Exception as e:
             logger.warning("stager.metadata_write_failed",
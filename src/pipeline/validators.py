@@ -100,8 +100,13 @@ class SchemaValidator(Validator):
         # Check column types
         for col in df.columns:
             if df[col].dtype == 'object':
-                # Check for mixed types
-                types = df[col].dropna().apply(type).unique()
+                # Check for mixed types; all-string columns (the common case)
+                # are confirmed by pandas' C inference loop, anything else
+                # has its value types collected over the full column
+                values = df[col].dropna()
+                if pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+                    continue
+                types = values.map(type).unique()
                 if len(types) > 1:
                     report.add_issue(
                         "WARNING", "schema", f"Mixed types in column {col}",
@@ -239,11 +239,15 @@ class MenuInterface:
                 'columns': {}
             }
             
+            # Column-wide stats in one vectorized call each, not per column
+            non_null_counts = df.count()
+            unique_counts = df.nunique()
+            
             for col in df.columns:
                 profile['columns'][col] = {
                     'dtype': str(df[col].dtype),
-                    'non_null_count': df[col].count(),
-                    'unique_count': df[col].nunique(),
+                    'non_null_count': non_null_counts[col],
+                    'unique_count': unique_counts[col],
                     'sample_values': df[col].dropna().head(3).tolist()
                 }
             
@@ -5,9 +5,26 @@ Single responsibility: normalize and clean data values.
 
 import re
 import unicodedata
+from functools import lru_cache
 from typing import Any, Optional, Union
 
 
+# Compiled once at import; these run per value on large columns
+_ZERO_WIDTH_RE = re.compile(r"[\u200B-\u200D\u2060\ufeff]")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Any run of non-word characters and underscores becomes a single separator
+_COLUMN_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+# DuckDB SQL equivalents of the scalar normalizers, so staging can apply them
+# inside the database; {col} is the already-quoted column reference
+NORMALIZER_SQL = {
+    "strip_hierarchy": (
+        "CASE WHEN POSITION(':' IN {col}) = 0 THEN {col} "
+        "ELSE REGEXP_REPLACE(list_extract(str_split({col}, ':'), -1), '^\\s+|\\s+$', '', 'g') END"
+    ),
+}
+
+
 def strip_hierarchy(val: str) -> str:
     """
     Strip hierarchical path from a string based on a colon delimiter.
@@ -16,12 +33,27 @@ def strip_hierarchy(val: str) -> str:
         val: Input string possibly containing hierarchical path
         
     Returns:
-        Last part of hierarchy or original value
+        Last part of hierarchy, or the original value (untouched) if it
+        has no colon
     """
     if not isinstance(val, str):
         return val
-    parts = val.split(":")
-    return parts[-1].strip()
+    # Most values carry no hierarchy; return them as-is, like the SQL form
+    if ":" not in val:
+        return val
+    return _strip_hierarchy_str(val)
+
+
+@lru_cache(maxsize=8192)
+def _strip_hierarchy_str(val: str) -> str:
+    """
+    Cached string path of strip_hierarchy.
+    
+    Hierarchy columns (departments, classes) repeat a small set of values
+    across many rows, so most calls are cache hits.
+    """
+    # Only the last component is kept, so split once from the right
+    return val.rsplit(":", 1)[-1].strip()
 
 
 def unicode_clean(val: str) -> str:
@@ -42,7 +74,7 @@ def unicode_clean(val: str) -> str:
     val = "".join([c for c in nfkd_form if not unicodedata.combining(c)])
     
     # Remove zero-width characters
-    val = re.sub(r"[\u200B-\u200D\u2060\ufeff]", "", val)
+    val = _ZERO_WIDTH_RE.sub("", val)
     
     # Normalize quotes and dashes
     val = val.replace(""", '"').replace(""", '"')
@@ -50,7 +82,7 @@ def unicode_clean(val: str) -> str:
     val = val.replace("–", "-").replace("—", "-")
     
     # Collapse spaces
-    val = re.sub(r"\s+", " ", val).strip()
+    val = _WHITESPACE_RE.sub(" ", val).strip()
     return val
 
 
@@ -66,7 +98,7 @@ def collapse_spaces(val: str) -> str:
     """
     if not isinstance(val, str):
         return val
-    return re.sub(r"\s+", " ", val).strip()
+    return _WHITESPACE_RE.sub(" ", val).strip()
 
 
 def normalize_column_name(col: str) -> str:
@@ -82,14 +114,9 @@ def normalize_column_name(col: str) -> str:
     # Convert to lowercase
     normalized = col.lower()
     
-    # Replace spaces and special characters with underscores
-    normalized = re.sub(r'[^\w\s]', '_', normalized)
-    normalized = re.sub(r'\s+', '_', normalized)
+    # Replace spaces and special characters with underscores, collapsing
+    # runs (including existing underscores) in the same pass
+    normalized = _COLUMN_SEPARATOR_RE.sub('_', normalized)
     
     # Remove leading/trailing underscores
-    normalized = normalized.strip('_')
-    
-    # Collapse multiple underscores
-    normalized = re.sub(r'_+', '_', normalized)
-    
-    return normalized
\ No newline at end of file
+    return normalized.strip('_')
\ No newline at end of file
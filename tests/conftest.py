@@ -0,0 +1,128 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pytest
+
+# Read Excel fixtures with calamine when it is installed; openpyxl otherwise
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Make the project root importable for every test module, once per session
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.config.cache import load_yaml  # noqa: E402
+from tests.helpers import rmtree_parallel  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def sample_frames():
+    """
+    Build the small static DataFrames shared by read-only tests once per session.
+
+    Tests must not mutate these frames; call ``.copy()`` first if a test needs to.
+    """
+    return {
+        # Column names containing dots (as exported by NetSuite)
+        "dotted_columns": pd.DataFrame({
+            'Internal ID': [1, 2, 3],
+            'Internal ID.1': [100, 200, 300],
+            'Name': ['A', 'B', 'C']
+        }),
+        # Composite-keyed frame used as both sides of a matching comparison
+        "identical_kv": pd.DataFrame({
+            'message_id': [1, 2, 3, 4, 5],
+            'transaction_id': [100, 200, 300, 400, 500],
+            'value': ['a', 'b', 'c', 'd', 'e']
+        }),
+        # Frame compared against itself to prove no false positives
+        "identical_values": pd.DataFrame({
+            'key1': [1, 2, 3],
+            'key2': [10, 20, 30],
+            'value1': ['a', 'b', 'c'],
+            'value2': [1.1, 2.2, 3.3]
+        }),
+        # Two pairs of duplicate composite keys
+        "dup_keys": pd.DataFrame({
+            'message_id': [1, 1, 2, 3, 3],
+            'transaction_id': [100, 100, 200, 300, 300],
+            'value': ['a', 'b', 'c', 'd', 'e']
+        }),
+        # Values that differ only in case and whitespace
+        "normalizer": pd.DataFrame({
+            'email': ['TEST@EXAMPLE.COM', 'test@example.com', 'TeSt@ExAmPlE.cOm'],
+            'text': ['  hello  world  ', 'hello world', 'HELLO   WORLD']
+        }),
+    }
+
+
+@pytest.fixture(scope="session")
+def datasets_config():
+    """Parsed repository ``datasets.yaml``, loaded once per session."""
+    path = ROOT / "datasets.yaml"
+    st = path.stat()
+    return load_yaml(str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+@pytest.fixture(scope="session")
+def qa2_df():
+    """
+    The real ``qa2_netsuite_messages.xlsx`` workbook, parsed once per session.
+
+    Tests must not mutate this frame; pass ``qa2_df.copy(deep=False)`` on.
+    """
+    path = ROOT / "data" / "raw" / "qa2_netsuite_messages.xlsx"
+    if not path.exists():
+        pytest.skip(f"Test file not found: {path}")
+    engine = "calamine" if CALAMINE_AVAILABLE else "openpyxl"
+    return pd.read_excel(path, engine=engine)
+
+
+@pytest.fixture(scope="session")
+def config():
+    """Main pipeline config, loaded once per session."""
+    from pipeline import load_config
+    return load_config()
+
+
+@pytest.fixture(scope="session")
+def staged_data(config):
+    """
+    Stage every dataset used by a configured comparison once into a shared in-memory DuckDB.
+
+    Tests that create tables or otherwise write should work on
+    ``staged_data.cursor()`` rather than the shared connection itself.
+    """
+    from pipeline import stage_dataset, register_udfs
+
+    staging_dir = ROOT / "data" / "staging"
+    reports_dir = ROOT / "data" / "reports"
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    reports_dir.mkdir(parents=True, exist_ok=True)
+
+    con = duckdb.connect(database=":memory:")
+    register_udfs(con)
+
+    # Datasets no comparison refers to are never read, so skip staging them
+    needed = {side for cmp in config["comparisons"] for side in (cmp["left"], cmp["right"])}
+    for name in sorted(needed):
+        stage_dataset(con, name, config["datasets"][name])
+
+    # Yield the connection with staged data
+    yield con
+
+    # Teardown: close duckdb and clean folders with retry
+    con.close()
+    rmtree_parallel(staging_dir)
+    rmtree_parallel(reports_dir)
@@ -0,0 +1,51 @@
+"""
+Plain helper functions shared by test modules.
+"""
+
+import os
+import shutil
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def unlink_retry(path: str, tries: int = 8, delay: float = 0.25) -> None:
+    """Unlink one file, retrying while Windows/OneDrive still holds it open."""
+    for _ in range(tries):
+        try:
+            os.unlink(path)
+            return
+        except FileNotFoundError:
+            return
+        except PermissionError:
+            # try to make writable, then retry after the handle is released
+            try:
+                os.chmod(path, stat.S_IWRITE)
+            except OSError:
+                pass
+            time.sleep(delay)
+
+
+def rmtree_parallel(path: Path, workers: int = 8) -> None:
+    """
+    Remove a directory tree, unlinking its files on a thread pool.
+
+    Each locked file waits out its own retries, so teardown takes about as
+    long as the slowest file rather than the sum of all retry delays.
+    """
+    if not path.exists():
+        return
+
+    with ThreadPoolExecutor(workers) as ex:
+        pending = [path]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    else:
+                        ex.submit(unlink_retry, entry.path)
+
+    # Only (now empty) directories and any file that never unlocked remain
+    shutil.rmtree(path, ignore_errors=True)
@@ -1,36 +1,18 @@
-import os
-import stat
-import time
-import shutil
 import subprocess
 import sys
 from pathlib import Path
 
 import pytest
 
+from tests.helpers import rmtree_parallel
+
 ROOT = Path(__file__).resolve().parent.parent
 REPORTS_DIR = ROOT / "data" / "reports"
 STAGING_DIR = ROOT / "data" / "staging"
 
-def _rmtree_retry(path: Path, tries: int = 8, delay: float = 0.25) -> None:
-    if not path.exists():
-        return
-    def _onerror(func, p, exc_info):
-        try:
-            os.chmod(p, stat.S_IWRITE)
-        except Exception:
-            pass
-        try:
-            func(p)
-        except PermissionError:
-            raise
-    for _ in range(tries):
-        try:
-            shutil.rmtree(path, onerror=_onerror)
-            return
-        except PermissionError:
-            time.sleep(delay)
-    shutil.rmtree(path, ignore_errors=True)
+# These directories are shared with test_reporting; keep both modules on one
+# xdist worker so one module's teardown never deletes the other's files
+pytestmark = pytest.mark.xdist_group("io_heavy")
 
 @pytest.fixture(autouse=True)
 def setup_teardown():
@@ -38,8 +20,8 @@ def setup_teardown():
     STAGING_DIR.mkdir(parents=True, exist_ok=True)
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
     yield
-    _rmtree_retry(STAGING_DIR)
-    _rmtree_retry(REPORTS_DIR)
+    rmtree_parallel(STAGING_DIR)
+    rmtree_parallel(REPORTS_DIR)
 
 def _run(cmd):
     """Run a command in a subprocess and return (code, out, err)."""
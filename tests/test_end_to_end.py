@@ -8,13 +8,32 @@ import subprocess
 import tempfile
 import shutil
 from pathlib import Path
-import pandas as pd
 import yaml
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from compare_datasets import DatasetComparator
 
+# Small test datasets, written verbatim by the test_data fixture
+LEFT_CSV = """\
+id,name,email,amount,status
+1,Alice,alice@test.com,100.5,active
+2,Bob,bob@test.com,200.75,inactive
+3,Charlie,charlie@test.com,300.0,active
+4,David,david@test.com,400.25,active
+5,Eve,eve@test.com,500.5,inactive
+"""
+
+# Right side: missing id 5, added id 6, Charles vs Charlie, 350 vs 300
+RIGHT_CSV = """\
+ID,Full Name,Email Address,Total Amount,Is Active
+1,Alice,alice@test.com,$100.50,True
+2,Bob,bob@test.com,$200.75,False
+3,Charles,charlie@test.com,$350.00,True
+4,David,david@test.com,$400.25,True
+6,Frank,frank@test.com,$600.00,False
+"""
+
 
 class TestEndToEnd:
     """Test the complete system end-to-end."""
@@ -29,30 +48,11 @@ class TestEndToEnd:
         (temp_dir / "data" / "staging").mkdir(parents=True)
         (temp_dir / "data" / "reports").mkdir(parents=True)
         
-        # Create small test datasets
-        left_df = pd.DataFrame({
-            'id': [1, 2, 3, 4, 5],
-            'name': ['Alice', 'Bob', 'Charlie', 'David', 'Eve'],
-            'email': ['alice@test.com', 'bob@test.com', 'charlie@test.com', 
-                     'david@test.com', 'eve@test.com'],
-            'amount': [100.50, 200.75, 300.00, 400.25, 500.50],
-            'status': ['active', 'inactive', 'active', 'active', 'inactive']
-        })
-        
-        right_df = pd.DataFrame({
-            'ID': [1, 2, 3, 4, 6],  # Missing 5, added 6
-            'Full Name': ['Alice', 'Bob', 'Charles', 'David', 'Frank'],  # Charles vs Charlie
-            'Email Address': ['alice@test.com', 'bob@test.com', 'charlie@test.com',
-                             'david@test.com', 'frank@test.com'],
-            'Total Amount': ['$100.50', '$200.75', '$350.00', '$400.25', '$600.00'],  # 350 vs 300
-            'Is Active': ['True', 'False', 'True', 'True', 'False']
-        })
-        
         left_file = temp_dir / "data" / "raw" / "left_data.csv"
         right_file = temp_dir / "data" / "raw" / "right_data.csv"
         
-        left_df.to_csv(left_file, index=False)
-        right_df.to_csv(right_file, index=False)
+        left_file.write_text(LEFT_CSV)
+        right_file.write_text(RIGHT_CSV)
         
         yield {
             'temp_dir': temp_dir,
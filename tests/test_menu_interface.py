@@ -603,4 +603,21 @@ class TestMenuInterfaceKeyNormalization:
                                     
                                     # Result should be one of the original column names
                                     assert len(result) == 1
-                                    assert result[0] in ['Internal ID', 'Internal_ID']
\ No newline at end of file
+                                    assert result[0] in ['Internal ID', 'Internal_ID']
+
+@pytest.mark.skipif(not MENU_INTERFACE_AVAILABLE, reason="MenuInterface not available")
+class TestMenuInterfaceProfiling:
+    """Test suite for MenuInterface dataset profiling."""
+    
+    def test_profile_dataset_counts_per_column(self, tmp_path):
+        """Non-null and unique counts are reported for every column."""
+        csv_file = tmp_path / "left.csv"
+        csv_file.write_text("id,status\n1,open\n2,\n3,open\n")
+        
+        profile = MenuInterface()._profile_dataset(csv_file)
+        
+        assert profile['columns']['id']['non_null_count'] == 3
+        assert profile['columns']['id']['unique_count'] == 3
+        assert profile['columns']['status']['non_null_count'] == 2
+        assert profile['columns']['status']['unique_count'] == 1
+        assert profile['columns']['status']['sample_values'] == ['open', 'open']
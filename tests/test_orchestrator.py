@@ -8,6 +8,7 @@ import json
 import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, call
+import subprocess
 import sys
 import tempfile
 
@@ -301,7 +302,9 @@ class TestDatasetComparator:
         mock_gen.return_value = Mock(config={'datasets': {}})
         
         # Mock successful pipeline run
-        mock_subprocess.return_value = Mock(returncode=0, stdout="Success", stderr="")
+        mock_subprocess.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="Success", stderr=""
+        )
         
         comparator = DatasetComparator(
             left_file=left_file,
@@ -5,26 +5,47 @@ Using TDD approach: write tests first, then fix the issues.
 
 import pytest
 import sys
-import subprocess
-import tempfile
 import shutil
+import subprocess
 from pathlib import Path
-from unittest.mock import patch, Mock
-import pandas as pd
+from unittest.mock import patch
 import yaml
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from compare_datasets import DatasetComparator
+# Sample data files, pre-encoded so the workspace fixture is a plain write
+LEFT_CSV_BYTES = (
+    b"id,name,amount\n"
+    b"1,Alice,100\n"
+    b"2,Bob,200\n"
+    b"3,Charlie,300\n"
+)
+RIGHT_CSV_BYTES = (
+    b"id,full_name,total\n"
+    b"1,Alice,100\n"
+    b"2,Bob,200\n"
+    b"3,Charles,350\n"  # Note: Charles vs Charlie, 350 vs 300
+)
+
+
+@pytest.fixture(scope="session")
+def comparator_factory():
+    """Import DatasetComparator once and return a constructor for it."""
+    from compare_datasets import DatasetComparator
+    
+    def make(**kwargs):
+        return DatasetComparator(**kwargs)
+    
+    return make
 
 
 class TestPipelineFailures:
     """Tests that demonstrate current pipeline failures."""
     
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create a temporary workspace for testing."""
-        temp_dir = Path(tempfile.mkdtemp())
+    @pytest.fixture(scope="module")
+    def temp_workspace(self, tmp_path_factory):
+        """Create a temporary workspace shared by the tests in this module."""
+        temp_dir = tmp_path_factory.mktemp("ws")
         
         # Create directory structure
         (temp_dir / "data" / "raw").mkdir(parents=True)
@@ -33,69 +54,70 @@ class TestPipelineFailures:
         (temp_dir / "data" / "comparisons").mkdir(parents=True)
         
         # Create sample data files
-        left_df = pd.DataFrame({
-            'id': [1, 2, 3],
-            'name': ['Alice', 'Bob', 'Charlie'],
-            'amount': [100, 200, 300]
-        })
-        
-        right_df = pd.DataFrame({
-            'id': [1, 2, 3],
-            'full_name': ['Alice', 'Bob', 'Charles'],  # Note: Charles vs Charlie
-            'total': [100, 200, 350]  # Note: 350 vs 300
-        })
-        
         left_file = temp_dir / "data" / "raw" / "left.csv"
         right_file = temp_dir / "data" / "raw" / "right.csv"
         
-        left_df.to_csv(left_file, index=False)
-        right_df.to_csv(right_file, index=False)
+        left_file.write_bytes(LEFT_CSV_BYTES)
+        right_file.write_bytes(RIGHT_CSV_BYTES)
         
         yield {
             'temp_dir': temp_dir,
             'left_file': str(left_file),
             'right_file': str(right_file)
         }
+    
+    @pytest.fixture(scope="class")
+    def shared_comparator(self, temp_workspace, comparator_factory):
+        """One comparator for tests that inspect it without calling run()."""
+        return comparator_factory(
+            left_file=temp_workspace['left_file'],
+            right_file=temp_workspace['right_file'],
+            interactive=False,
+            run_pipeline=True,
+            verbose=False
+        )
+    
+    @pytest.fixture
+    def isolated_workspace(self, temp_workspace, tmp_path_factory):
+        """Per-test copy of the shared workspace for tests that write into it."""
+        wdir = tmp_path_factory.mktemp("iso")
+        shutil.copytree(temp_workspace['temp_dir'], wdir, dirs_exist_ok=True)
         
-        # Cleanup
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        return {
+            'temp_dir': wdir,
+            'left_file': str(wdir / "data" / "raw" / "left.csv"),
+            'right_file': str(wdir / "data" / "raw" / "right.csv")
+        }
     
-    def test_issue_1_config_file_location_mismatch(self, temp_workspace):
+    def test_issue_1_config_file_location_mismatch(self, isolated_workspace, comparator_factory, monkeypatch):
         """
         ISSUE #1: Config file location mismatch
         - compare_datasets.py saves to: output_dir/datasets.yaml
         - pipeline.py looks for: ROOT/datasets.yaml
         """
-        import os
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(temp_workspace['temp_dir'])
-            
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
-                interactive=False,
-                run_pipeline=False,
-                verbose=False
-            )
-            
-            result = comparator.run()
-            assert result['success'] is True
-            
-            # Check where files are saved
-            output_yaml = comparator.output_dir / "datasets.yaml"
-            root_yaml = Path.cwd() / "datasets.yaml"
-            
-            assert output_yaml.exists(), "Config saved to output_dir"
-            assert not root_yaml.exists(), "Config NOT saved to ROOT (where pipeline expects it)"
-            
-            # This is the problem!
-            print(f"\n❌ ISSUE CONFIRMED:")
-            print(f"   Config saved to: {output_yaml}")
-            print(f"   Pipeline expects: {root_yaml}")
-            
-        finally:
-            os.chdir(original_cwd)
+        monkeypatch.chdir(isolated_workspace['temp_dir'])
+        comparator = comparator_factory(
+            left_file=isolated_workspace['left_file'],
+            right_file=isolated_workspace['right_file'],
+            interactive=False,
+            run_pipeline=False,
+            verbose=False
+        )
+        
+        result = comparator.run()
+        assert result['success'] is True
+        
+        # Check where files are saved
+        output_yaml = comparator.output_dir / "datasets.yaml"
+        root_yaml = isolated_workspace['temp_dir'] / "datasets.yaml"
+        
+        assert output_yaml.exists(), "Config saved to output_dir"
+        assert not root_yaml.exists(), "Config NOT saved to ROOT (where pipeline expects it)"
+        
+        # This is the problem!
+        print(f"\n❌ ISSUE CONFIRMED:")
+        print(f"   Config saved to: {output_yaml}")
+        print(f"   Pipeline expects: {root_yaml}")
     
     def test_issue_2_pipeline_no_config_argument(self, temp_workspace):
         """
@@ -108,7 +130,9 @@ class TestPipelineFailures:
         
         # Mock subprocess to capture the command
         with patch('subprocess.run') as mock_run:
-            mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+            mock_run.return_value = subprocess.CompletedProcess(
+                args=[], returncode=0, stdout="", stderr=""
+            )
             
             # This function builds wrong command
             config_file = "test_config.yaml"
@@ -125,25 +149,27 @@ class TestPipelineFailures:
             print(f"   Command built: {call_args}")
             print(f"   But pipeline.py doesn't accept --config argument!")
     
-    def test_issue_3_silent_failure_empty_stderr(self, temp_workspace):
+    def test_issue_3_silent_failure_empty_stderr(self, isolated_workspace, comparator_factory):
         """
         ISSUE #3: Silent failures with empty stderr
         - Pipeline fails but returns empty stderr
         - compare_datasets shows misleading success message
         """
-        comparator = DatasetComparator(
-            left_file=temp_workspace['left_file'],
-            right_file=temp_workspace['right_file'],
+        comparator = comparator_factory(
+            left_file=isolated_workspace['left_file'],
+            right_file=isolated_workspace['right_file'],
             interactive=False,
             run_pipeline=True,
             verbose=False
         )
         
         # Mock subprocess with silent failure
-        mock_result = Mock()
-        mock_result.returncode = 1  # Failure
-        mock_result.stderr = ""  # Empty error message
-        mock_result.stdout = ""
+        mock_result = subprocess.CompletedProcess(
+            args=[],
+            returncode=1,  # Failure
+            stdout="",
+            stderr=""  # Empty error message
+        )
         
         with patch('subprocess.run', return_value=mock_result):
             result = comparator.run()
@@ -159,57 +185,41 @@ class TestPipelineFailures:
             print(f"   Pipeline failed with empty stderr")
             print(f"   User sees misleading success indicator")
     
-    def test_issue_4_no_error_handling_for_missing_config(self, temp_workspace):
+    def test_issue_4_no_error_handling_for_missing_config(self, temp_workspace, monkeypatch):
         """
         ISSUE #4: No error handling for missing config file in pipeline.py
         - pipeline.py assumes datasets.yaml exists
         - No try/except around load_config()
         """
-        import os
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(temp_workspace['temp_dir'])
-            
-            # Try to run pipeline without datasets.yaml
-            cmd = [sys.executable, "-c", """
-import sys
-sys.path.insert(0, r'C:\\Users\\JoelAbbott\\OneDrive - Compass Datacenters, LLC\\Desktop\\my_repos\\duckdb-data-diff')
-from pipeline import load_config
-try:
-    cfg = load_config()
-except FileNotFoundError as e:
-    print(f"ERROR: {e}")
-    sys.exit(1)
-"""]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Pipeline will crash with FileNotFoundError
-            assert result.returncode == 1
-            assert "FileNotFoundError" in result.stderr or "ERROR:" in result.stdout
-            
-            print(f"\n❌ ISSUE CONFIRMED:")
-            print(f"   Pipeline crashes when datasets.yaml missing")
-            print(f"   No graceful error handling")
-            
-        finally:
-            os.chdir(original_cwd)
+        # Try to load the pipeline config without datasets.yaml
+        monkeypatch.chdir(temp_workspace['temp_dir'])
+        from pipeline import load_config
+        
+        # Pipeline will crash with FileNotFoundError
+        with pytest.raises(FileNotFoundError):
+            load_config()
+        
+        print(f"\n❌ ISSUE CONFIRMED:")
+        print(f"   Pipeline crashes when datasets.yaml missing")
+        print(f"   No graceful error handling")
     
-    def test_issue_5_wrong_success_indicator(self, temp_workspace):
+    def test_issue_5_wrong_success_indicator(self, isolated_workspace, comparator_factory):
         """
         ISSUE #5: Wrong success indicator in summary
         Line 606 in compare_datasets.py uses self.config instead of pipeline result
         """
-        comparator = DatasetComparator(
-            left_file=temp_workspace['left_file'],
-            right_file=temp_workspace['right_file'],
+        comparator = comparator_factory(
+            left_file=isolated_workspace['left_file'],
+            right_file=isolated_workspace['right_file'],
             interactive=False,
             run_pipeline=True,
             verbose=True
         )
         
         # Mock subprocess to fail
-        mock_result = Mock(returncode=1, stderr="Pipeline failed", stdout="")
+        mock_result = subprocess.CompletedProcess(
+            args=[], returncode=1, stdout="", stderr="Pipeline failed"
+        )
         
         with patch('subprocess.run', return_value=mock_result):
             with patch('builtins.print') as mock_print:
@@ -225,20 +235,14 @@ except FileNotFoundError as e:
                 print(f"   Line 606 uses 'self.config' to determine success")
                 print(f"   Should use actual pipeline result!")
     
-    def test_issue_6_no_validation_before_pipeline_run(self, temp_workspace):
+    def test_issue_6_no_validation_before_pipeline_run(self, shared_comparator):
         """
         ISSUE #6: No validation before running pipeline
         - No check if datasets.yaml exists in expected location
         - No validation of config structure
         - No dry-run option
         """
-        comparator = DatasetComparator(
-            left_file=temp_workspace['left_file'],
-            right_file=temp_workspace['right_file'],
-            interactive=False,
-            run_pipeline=True,
-            verbose=False
-        )
+        comparator = shared_comparator
         
         # The _run_pipeline method doesn't validate anything before subprocess
         # It just blindly runs the command
@@ -247,61 +251,41 @@ except FileNotFoundError as e:
         print(f"   No pre-flight checks before pipeline execution")
         print(f"   No validation of config location or structure")
     
-    def test_proposed_fix_1_copy_config_to_root(self, temp_workspace):
+    def test_proposed_fix_1_copy_config_to_root(self, isolated_workspace, comparator_factory, monkeypatch):
         """
         PROPOSED FIX #1: Copy datasets.yaml to ROOT before running pipeline
         """
-        import os
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(temp_workspace['temp_dir'])
-            
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
-                interactive=False,
-                run_pipeline=False,
-                verbose=False
-            )
-            
-            result = comparator.run()
-            
-            # PROPOSED FIX: Copy config to root
-            output_yaml = comparator.output_dir / "datasets.yaml"
-            root_yaml = Path.cwd() / "datasets.yaml"
-            
-            if output_yaml.exists() and not root_yaml.exists():
-                shutil.copy2(output_yaml, root_yaml)
-            
-            assert root_yaml.exists(), "Config now exists where pipeline expects it"
-            
-            print(f"\n✅ FIX VALIDATED:")
-            print(f"   Copy datasets.yaml from {output_yaml}")
-            print(f"   To {root_yaml}")
-            print(f"   Before running pipeline")
-            
-        finally:
-            os.chdir(original_cwd)
-    
-    def test_proposed_fix_2_add_config_argument(self, temp_workspace):
-        """
-        PROPOSED FIX #2: Add --config argument to pipeline.py
-        """
-        # This would require modifying pipeline.py to accept --config
-        # and use it instead of hardcoded ROOT / "datasets.yaml"
+        monkeypatch.chdir(isolated_workspace['temp_dir'])
+        comparator = comparator_factory(
+            left_file=isolated_workspace['left_file'],
+            right_file=isolated_workspace['right_file'],
+            interactive=False,
+            run_pipeline=False,
+            verbose=False
+        )
+        
+        result = comparator.run()
         
-        print(f"\n✅ FIX PROPOSED:")
-        print(f"   Modify pipeline.py to accept --config argument")
-        print(f"   Update load_config() to use provided path")
-        print(f"   This is the cleaner architectural solution")
+        # PROPOSED FIX: Copy config to root
+        output_yaml = comparator.output_dir / "datasets.yaml"
+        root_yaml = isolated_workspace['temp_dir'] / "datasets.yaml"
+        
+        if output_yaml.exists() and not root_yaml.exists():
+            shutil.copy2(output_yaml, root_yaml)
+        
+        assert root_yaml.exists(), "Config now exists where pipeline expects it"
+        
+        print(f"\n✅ FIX VALIDATED:")
+        print(f"   Copy datasets.yaml from {output_yaml}")
+        print(f"   To {root_yaml}")
+        print(f"   Before running pipeline")
     
-    def test_proposed_fix_3_better_error_messages(self, temp_workspace):
-        """
-        PROPOSED FIX #3: Add better error handling and messages
-        """
-        print(f"\n✅ FIX PROPOSED:")
-        print(f"   1. Add try/except in pipeline.py load_config()")
-        print(f"   2. Check subprocess.stderr AND stdout for errors")
-        print(f"   3. Fix line 606 to use pipeline_success not self.config")
-        print(f"   4. Add pre-flight validation before pipeline run")
-        print(f"   5. Capture and display actual error messages")
\ No newline at end of file
+    # PROPOSED FIX #2 (config-arg): add a --config argument to pipeline.py and
+    # have load_config() use it instead of the hardcoded ROOT / "datasets.yaml".
+    # PROPOSED FIX #3 (error-msgs): wrap load_config() in try/except, check
+    # subprocess stderr AND stdout, report pipeline_success rather than
+    # self.config, and validate config location before running the pipeline.
+    @pytest.mark.parametrize("fix", ["config-arg", "error-msgs"])
+    def test_proposed_fix_doc(self, fix):
+        """PROPOSED FIXES #2 and #3 are documented above; nothing to verify yet."""
+        pytest.skip(f"documentation placeholder: {fix}")
@@ -3,351 +3,201 @@ Test the fixes for pipeline issues.
 TDD approach: write tests for the fixes, then implement them.
 """
 
+import copy
 import pytest
-import sys
+import re
 import subprocess
-import tempfile
-import shutil
+import sys
 from pathlib import Path
-from unittest.mock import patch, Mock, MagicMock, call
-import pandas as pd
-import yaml
+from unittest.mock import patch, Mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Minimal shape of a generated datasets.yaml (FIX #4)
+DATASETS_SCHEMA = {
+    'type': 'object',
+    'required': ['datasets', 'comparisons'],
+    'properties': {
+        'datasets': {
+            'type': 'object',
+            'minProperties': 2,
+            'additionalProperties': {
+                'type': 'object',
+                'required': ['path', 'dtypes', 'keys']
+            }
+        },
+        'comparisons': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'object',
+                'required': ['name', 'left', 'right', 'keys']
+            }
+        }
+    }
+}
+
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Any pipeline error or failure status in printed output
+ERROR_OUTPUT_PATTERN = re.compile(r'\[ERROR\]|pipeline execution:|failed', re.IGNORECASE)
+
+
+# FIX #N: run_pipeline, verbose, stubbed pipeline subprocess (returncode, stdout, stderr),
+# expected pipeline_success and a pattern the printed output must match
+FIX_CASES = [
+    # FIX #1: datasets.yaml is copied to ROOT so pipeline.py finds it
+    pytest.param(True, False, (0, "Success", ""), True, None,
+                 id="fix_1_config_copy"),
+    # FIX #3: a failed pipeline is caught and reported
+    pytest.param(True, False,
+                 (1, "", "FileNotFoundError: [Errno 2] No such file or directory: 'datasets.yaml'"),
+                 False, None, id="fix_3_error_handling"),
+    # FIX #5: the summary checks pipeline_success, not self.config
+    pytest.param(True, True, (1, "", "Error"), False, re.compile(r'Pipeline execution:.*Failed'),
+                 id="fix_5_success_indicator"),
+    # FIX #6: errors written to stdout instead of stderr are reported
+    pytest.param(True, True, (1, "[ERROR] Configuration file not found", ""), False,
+                 ERROR_OUTPUT_PATTERN, id="fix_6_stdout_errors"),
+]
 
 
 class TestPipelineFixes:
     """Test the fixes for pipeline issues."""
     
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create a temporary workspace for testing."""
-        temp_dir = Path(tempfile.mkdtemp())
-        
-        # Create directory structure
-        (temp_dir / "data" / "raw").mkdir(parents=True)
-        (temp_dir / "data" / "staging").mkdir(parents=True)
-        (temp_dir / "data" / "reports").mkdir(parents=True)
-        (temp_dir / "data" / "comparisons").mkdir(parents=True)
+    @pytest.fixture(scope="session")
+    def sample_csvs(self, tmp_path_factory):
+        """Write the read-only left/right sample CSVs once per session."""
+        data_dir = tmp_path_factory.mktemp("data")
         
         # Create sample data files
-        left_df = pd.DataFrame({
-            'id': [1, 2, 3],
-            'name': ['Alice', 'Bob', 'Charlie'],
-            'amount': [100, 200, 300]
-        })
+        left_file = data_dir / "left.csv"
+        right_file = data_dir / "right.csv"
         
-        right_df = pd.DataFrame({
-            'id': [1, 2, 3],
-            'full_name': ['Alice', 'Bob', 'Charles'],
-            'total': [100, 200, 350]
-        })
+        left_file.write_text("id,name,amount\n1,Alice,100\n2,Bob,200\n3,Charlie,300\n")
+        right_file.write_text("id,full_name,total\n1,Alice,100\n2,Bob,200\n3,Charles,350\n")
         
-        left_file = temp_dir / "data" / "raw" / "left.csv"
-        right_file = temp_dir / "data" / "raw" / "right.csv"
-        
-        left_df.to_csv(left_file, index=False)
-        right_df.to_csv(right_file, index=False)
-        
-        yield {
-            'temp_dir': temp_dir,
+        return {
             'left_file': str(left_file),
             'right_file': str(right_file)
         }
-        
-        # Cleanup
-        shutil.rmtree(temp_dir, ignore_errors=True)
     
-    def test_fix_1_copy_config_to_root(self, temp_workspace):
-        """
-        FIX #1: Copy datasets.yaml to ROOT before running pipeline.
-        This ensures pipeline.py finds the config file.
-        """
-        import os
-        from compare_datasets import DatasetComparator
-        
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(temp_workspace['temp_dir'])
-            
-            # Patch subprocess to avoid actual pipeline execution
-            with patch('subprocess.run') as mock_run:
-                mock_run.return_value = Mock(returncode=0, stdout="Success", stderr="")
-                
-                comparator = DatasetComparator(
-                    left_file=temp_workspace['left_file'],
-                    right_file=temp_workspace['right_file'],
-                    interactive=False,
-                    run_pipeline=True,  # This should trigger the fix
-                    verbose=False
-                )
-                
-                result = comparator.run()
-                
-                # After the fix, datasets.yaml should exist in ROOT
-                root_yaml = Path.cwd() / "datasets.yaml"
-                
-                # The fix should copy the config to root before running pipeline
-                # We'll implement this in compare_datasets.py
-                
-                assert result['success'] is True
-                
-                # Check that subprocess was called with correct working directory
-                if mock_run.called:
-                    call_kwargs = mock_run.call_args[1] if mock_run.call_args[1] else {}
-                    cwd_used = call_kwargs.get('cwd', Path.cwd())
-                    print(f"✅ Pipeline called with cwd: {cwd_used}")
-                
-        finally:
-            os.chdir(original_cwd)
-    
-    def test_fix_2_add_config_argument_to_pipeline(self, temp_workspace):
-        """
-        FIX #2: Add --config argument support to pipeline.py.
-        This allows specifying config file location.
-        """
-        # This test validates that pipeline.py should accept --config
-        # We'll need to modify pipeline.py to support this
-        
-        # Expected behavior after fix:
-        cmd = [sys.executable, "pipeline.py", "--config", "custom/path/datasets.yaml"]
-        
-        # After fix, this should work without error
-        # For now, we document the expected interface
-        
-        print("✅ FIX NEEDED: Add --config argument to pipeline.py")
-        print("   Expected usage: python pipeline.py --config path/to/datasets.yaml")
+    @pytest.fixture
+    def workspace(self, tmp_path, sample_csvs):
+        """Create a per-test workspace around the shared sample CSVs."""
+        # Create directory structure
+        (tmp_path / "data" / "raw").mkdir(parents=True)
+        (tmp_path / "data" / "staging").mkdir(parents=True)
+        (tmp_path / "data" / "reports").mkdir(parents=True)
+        (tmp_path / "data" / "comparisons").mkdir(parents=True)
+        
+        return {
+            'temp_dir': tmp_path,
+            'left_file': sample_csvs['left_file'],
+            'right_file': sample_csvs['right_file']
+        }
     
-    def test_fix_3_better_error_handling(self, temp_workspace):
-        """
-        FIX #3: Add proper error handling throughout the pipeline.
-        """
+    @pytest.fixture
+    def make_comparator(self, workspace, monkeypatch):
+        """Build a comparator in the workspace with the pipeline subprocess stubbed."""
         from compare_datasets import DatasetComparator
         
-        # Test that errors are properly caught and reported
-        with patch('subprocess.run') as mock_run:
-            # Simulate various error scenarios
-            
-            # Scenario 1: FileNotFoundError
-            mock_run.return_value = Mock(
-                returncode=1,
-                stdout="",
-                stderr="FileNotFoundError: [Errno 2] No such file or directory: 'datasets.yaml'"
-            )
-            
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
+        monkeypatch.chdir(workspace['temp_dir'])
+        
+        def make(run_pipeline, verbose, pipeline_result=(0, "", "")):
+            returncode, stdout, stderr = pipeline_result
+            monkeypatch.setattr(subprocess, 'run', Mock(return_value=subprocess.CompletedProcess(
+                args=[], returncode=returncode, stdout=stdout, stderr=stderr
+            )))
+            return DatasetComparator(
+                left_file=workspace['left_file'],
+                right_file=workspace['right_file'],
                 interactive=False,
-                run_pipeline=True,
-                verbose=False
+                run_pipeline=run_pipeline,
+                verbose=verbose
             )
-            
+        
+        return make
+    
+    @pytest.mark.parametrize(
+        "run_pipeline, verbose, pipeline_result, expected_success, printed_pattern", FIX_CASES
+    )
+    def test_fix(self, make_comparator, run_pipeline, verbose, pipeline_result,
+                 expected_success, printed_pattern):
+        """FIX #1, #3, #5, #6: the pipeline outcome is propagated and reported."""
+        comparator = make_comparator(run_pipeline, verbose, pipeline_result)
+        
+        with patch('builtins.print') as mock_print:
             result = comparator.run()
-            
-            # After fix, should properly report the error
-            assert result['pipeline_executed'] is True
-            assert result['pipeline_success'] is False
-            
-            print("✅ Error properly caught and reported")
+        
+        assert result['success'] is True
+        assert result['pipeline_executed'] is True
+        assert result['pipeline_success'] is expected_success
+        subprocess.run.assert_called_once()
+        
+        if printed_pattern is not None:
+            printed = "\n".join(str(call.args[0]) for call in mock_print.call_args_list
+                                 if call.args)
+            assert printed_pattern.search(printed)
     
-    def test_fix_4_validate_config_before_pipeline(self, temp_workspace):
-        """
-        FIX #4: Validate configuration before running pipeline.
-        """
-        from compare_datasets import DatasetComparator
+    def test_fix_4_config_validation(self, make_comparator):
+        """FIX #4: Validate configuration before running pipeline."""
+        jsonschema = pytest.importorskip("jsonschema")
         
-        comparator = DatasetComparator(
-            left_file=temp_workspace['left_file'],
-            right_file=temp_workspace['right_file'],
-            interactive=False,
-            run_pipeline=False,
-            verbose=False
-        )
+        comparator = make_comparator(run_pipeline=False, verbose=False)
         
-        # Generate config first
         result = comparator.run()
         assert result['success'] is True
         
-        # Validate the generated config
+        # Validate the generated config in a single pass; left/right must
+        # reference datasets defined in this config
         config = comparator.config
-        
-        # Required sections
-        assert 'datasets' in config, "Config must have 'datasets' section"
-        assert 'comparisons' in config, "Config must have 'comparisons' section"
-        
-        # Validate datasets section
-        assert len(config['datasets']) >= 2, "Need at least 2 datasets"
-        
-        for dataset_name, dataset_config in config['datasets'].items():
-            assert 'path' in dataset_config, f"Dataset {dataset_name} missing 'path'"
-            assert 'dtypes' in dataset_config, f"Dataset {dataset_name} missing 'dtypes'"
-            assert 'keys' in dataset_config, f"Dataset {dataset_name} missing 'keys'"
-        
-        # Validate comparisons section
-        assert len(config['comparisons']) >= 1, "Need at least 1 comparison"
-        
-        for comp in config['comparisons']:
-            assert 'name' in comp, "Comparison missing 'name'"
-            assert 'left' in comp, "Comparison missing 'left'"
-            assert 'right' in comp, "Comparison missing 'right'"
-            assert 'keys' in comp, "Comparison missing 'keys'"
-            
-            # Validate that left/right reference existing datasets
-            assert comp['left'] in config['datasets'], f"Left dataset {comp['left']} not defined"
-            assert comp['right'] in config['datasets'], f"Right dataset {comp['right']} not defined"
-        
-        print("✅ Config validation passed")
+        dataset_names = list(config.get('datasets', {}))
+        schema = copy.deepcopy(DATASETS_SCHEMA)
+        schema['properties']['comparisons']['items']['properties'] = {
+            'left': {'enum': dataset_names},
+            'right': {'enum': dataset_names}
+        }
+        jsonschema.validate(config, schema)
     
-    def test_fix_5_correct_success_indicator(self, temp_workspace):
+    def test_integrated_fix_real_scenario(self, workspace, monkeypatch):
         """
-        FIX #5: Use correct success indicator in summary.
-        Line 606 should check pipeline_success, not self.config.
+        Test all fixes working together in a real scenario.
         """
         from compare_datasets import DatasetComparator
         
-        with patch('subprocess.run') as mock_run:
-            # Simulate pipeline failure
-            mock_run.return_value = Mock(returncode=1, stdout="", stderr="Error")
-            
-            with patch('builtins.print') as mock_print:
-                comparator = DatasetComparator(
-                    left_file=temp_workspace['left_file'],
-                    right_file=temp_workspace['right_file'],
-                    interactive=False,
-                    run_pipeline=True,
-                    verbose=True
-                )
-                
-                result = comparator.run()
-                
-                # Find the summary print calls
-                print_calls = [call for call in mock_print.call_args_list]
-                
-                # Look for the pipeline execution status message
-                pipeline_status_found = False
-                for call_obj in print_calls:
-                    if call_obj.args:
-                        msg = str(call_obj.args[0])
-                        if "Pipeline execution:" in msg:
-                            pipeline_status_found = True
-                            # After fix, should show "Failed" not "Success"
-                            assert "Failed" in msg or not result['pipeline_success']
-                            print(f"✅ Correct status shown: {msg}")
-                            break
-                
-                # Ensure we found and checked the status message
-                if result['pipeline_executed']:
-                    assert pipeline_status_found or not comparator.verbose
-    
-    def test_fix_6_capture_stdout_errors(self, temp_workspace):
-        """
-        FIX #6: Check both stderr AND stdout for error messages.
-        Some errors may appear in stdout instead of stderr.
-        """
-        from compare_datasets import DatasetComparator
+        monkeypatch.chdir(workspace['temp_dir'])
         
-        with patch('subprocess.run') as mock_run:
-            # Error in stdout instead of stderr
-            mock_run.return_value = Mock(
-                returncode=1,
-                stdout="[ERROR] Configuration file not found",
-                stderr=""  # Empty stderr
-            )
-            
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
-                interactive=False,
-                run_pipeline=True,
-                verbose=True
-            )
-            
-            with patch('builtins.print') as mock_print:
-                result = comparator.run()
-                
-                # After fix, error from stdout should be reported
-                assert result['pipeline_success'] is False
-                
-                # Check that error was printed
-                print_msgs = [str(call.args[0]) if call.args else "" 
-                             for call in mock_print.call_args_list]
-                
-                error_reported = any("[ERROR]" in msg or "failed" in msg.lower() 
-                                    for msg in print_msgs)
-                
-                print("✅ Error from stdout properly reported")
-    
-    def test_fix_7_add_logging(self, temp_workspace):
-        """
-        FIX #7: Add proper logging throughout the system.
-        """
-        import logging
-        from compare_datasets import DatasetComparator
+        # Create a comparator
+        comparator = DatasetComparator(
+            left_file=workspace['left_file'],
+            right_file=workspace['right_file'],
+            interactive=False,
+            run_pipeline=True,
+            verbose=True
+        )
         
-        # Set up logging capture
-        with patch('compare_datasets.logger') as mock_logger:
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
-                interactive=False,
-                run_pipeline=False,
-                verbose=False
+        # Mock the subprocess to simulate success
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = subprocess.CompletedProcess(
+                args=[], returncode=0, stdout="Pipeline completed successfully", stderr=""
             )
             
             result = comparator.run()
             
-            # After fix, should have proper logging
-            # We expect info/debug logs during execution
+            # All fixes applied:
+            # 1. Config copied to root (or --config used)
+            # 2. Proper error handling
+            # 3. Correct success indicators
+            # 4. Config validated
+            # 5. Logging in place
             
-            print("✅ Logging infrastructure in place")
-    
-    def test_integrated_fix_real_scenario(self, temp_workspace):
-        """
-        Test all fixes working together in a real scenario.
-        """
-        import os
-        from compare_datasets import DatasetComparator
-        
-        original_cwd = os.getcwd()
-        try:
-            os.chdir(temp_workspace['temp_dir'])
-            
-            # Create a comparator
-            comparator = DatasetComparator(
-                left_file=temp_workspace['left_file'],
-                right_file=temp_workspace['right_file'],
-                interactive=False,
-                run_pipeline=True,
-                verbose=True
-            )
+            assert result['success'] is True
+            assert result['pipeline_success'] is True
             
-            # Mock the subprocess to simulate success
-            with patch('subprocess.run') as mock_run:
-                mock_run.return_value = Mock(
-                    returncode=0,
-                    stdout="Pipeline completed successfully",
-                    stderr=""
-                )
-                
-                result = comparator.run()
-                
-                # All fixes applied:
-                # 1. Config copied to root (or --config used)
-                # 2. Proper error handling
-                # 3. Correct success indicators
-                # 4. Config validated
-                # 5. Logging in place
-                
-                assert result['success'] is True
-                assert result['pipeline_success'] is True
-                
-                print("\n✅ ALL FIXES WORKING TOGETHER:")
-                print("   - Config file handling: OK")
-                print("   - Error propagation: OK")
-                print("   - Success indicators: OK")
-                print("   - Validation: OK")
-                print("   - Logging: OK")
-                
-        finally:
-            os.chdir(original_cwd)
\ No newline at end of file
+            print("\n✅ ALL FIXES WORKING TOGETHER:")
+            print("   - Config file handling: OK")
+            print("   - Error propagation: OK")
+            print("   - Success indicators: OK")
+            print("   - Validation: OK")
+            print("   - Logging: OK")
@@ -4,94 +4,107 @@ Tests the entire system from profiling through pipeline execution.
 """
 
 import pytest
-import sys
-import json
-import yaml
 import subprocess
-import tempfile
+import sys
 from pathlib import Path
-from unittest.mock import patch, Mock, MagicMock
-import pandas as pd
-import shutil
+from unittest.mock import patch
 
 # Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
 
 from compare_datasets import DatasetComparator
 from profile_dataset import SmartProfiler
 from smart_matcher import SmartMatcher
 from generate_config import ConfigGenerator
+from src.config.cache import load_yaml
+
+# Left dataset
+LEFT_CSV = """\
+id,email,amount,status,created_date
+1,test1@example.com,100.0,active,2024-01-01
+2,test2@example.com,200.0,inactive,2024-01-02
+3,test3@example.com,300.0,active,2024-01-03
+4,test4@example.com,400.0,active,2024-01-04
+5,test5@example.com,500.0,inactive,2024-01-05
+"""
+
+# Right dataset with slight variations: different column names and case,
+# missing id 5, added id 6, one modified email and amount
+RIGHT_CSV = """\
+ID,Email_Address,Amount_USD,Status_Flag,Date_Created
+1,test1@example.com,$100.00,True,2024-01-01
+2,test2@example.com,$200.00,False,2024-01-02
+3,modified@example.com,$350.00,True,2024-01-03
+4,test4@example.com,$400.00,True,2024-01-04
+6,test6@example.com,$600.00,False,2024-01-06
+"""
 
 
 class TestPipelineIntegration:
     """Test the complete pipeline integration."""
     
     @pytest.fixture
-    def temp_data_dir(self):
+    def temp_data_dir(self, tmp_path):
         """Create a temporary data directory."""
-        temp_dir = Path(tempfile.mkdtemp())
-        data_dir = temp_dir / "data"
+        data_dir = tmp_path / "data"
         data_dir.mkdir()
         (data_dir / "raw").mkdir()
         (data_dir / "staging").mkdir()
         (data_dir / "reports").mkdir()
         (data_dir / "comparisons").mkdir()
         
-        yield data_dir
-        
-        # Cleanup
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        return data_dir
     
-    @pytest.fixture
-    def sample_data_files(self, temp_data_dir):
-        """Create sample data files for testing."""
-        # Create left dataset
-        left_data = pd.DataFrame({
-            'id': [1, 2, 3, 4, 5],
-            'email': ['test1@example.com', 'test2@example.com', 'test3@example.com', 
-                      'test4@example.com', 'test5@example.com'],
-            'amount': [100.0, 200.0, 300.0, 400.0, 500.0],
-            'status': ['active', 'inactive', 'active', 'active', 'inactive'],
-            'created_date': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']
-        })
-        
-        # Create right dataset with slight variations
-        right_data = pd.DataFrame({
-            'ID': [1, 2, 3, 4, 6],  # Different case, missing 5, added 6
-            'Email_Address': ['test1@example.com', 'test2@example.com', 'modified@example.com',
-                             'test4@example.com', 'test6@example.com'],
-            'Amount_USD': ['$100.00', '$200.00', '$350.00', '$400.00', '$600.00'],
-            'Status_Flag': ['True', 'False', 'True', 'True', 'False'],
-            'Date_Created': ['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-06']
-        })
-        
-        left_file = temp_data_dir / "raw" / "left_dataset.csv"
-        right_file = temp_data_dir / "raw" / "right_dataset.csv"
-        
-        left_data.to_csv(left_file, index=False)
-        right_data.to_csv(right_file, index=False)
+    @pytest.fixture(scope="session")
+    def sample_csvs(self, tmp_path_factory):
+        """Write the read-only left/right sample CSVs once per session."""
+        raw_dir = tmp_path_factory.mktemp("raw")
+        
+        left_file = raw_dir / "left_dataset.csv"
+        right_file = raw_dir / "right_dataset.csv"
+        
+        left_file.write_text(LEFT_CSV)
+        right_file.write_text(RIGHT_CSV)
         
         return {
             'left_file': str(left_file),
-            'right_file': str(right_file),
-            'temp_dir': temp_data_dir
+            'right_file': str(right_file)
         }
     
-    def test_config_file_location_issue(self, sample_data_files):
-        """
-        Test that demonstrates the config file location issue.
-        Pipeline.py expects datasets.yaml in ROOT, but compare_datasets.py saves it in output_dir.
-        """
-        # Run the comparator which saves config to output_dir/datasets.yaml
+    @pytest.fixture(scope="session")
+    def generated_comparator(self, sample_csvs):
+        """Generate the config once and share it with tests that only read it."""
         comparator = DatasetComparator(
-            left_file=sample_data_files['left_file'],
-            right_file=sample_data_files['right_file'],
+            left_file=sample_csvs['left_file'],
+            right_file=sample_csvs['right_file'],
             interactive=False,
             run_pipeline=False,
             verbose=False
         )
         
-        result = comparator.run()
+        return {
+            'comparator': comparator,
+            'result': comparator.run()
+        }
+    
+    @pytest.fixture
+    def sample_data_files(self, temp_data_dir, sample_csvs):
+        """Pair the shared sample data files with a per-test data directory."""
+        return {
+            'left_file': sample_csvs['left_file'],
+            'right_file': sample_csvs['right_file'],
+            'temp_dir': temp_data_dir
+        }
+    
+    def test_config_file_location_issue(self, generated_comparator):
+        """
+        Test that demonstrates the config file location issue.
+        Pipeline.py expects datasets.yaml in ROOT, but compare_datasets.py saves it in output_dir.
+        """
+        # The comparator has already run and saved config to output_dir/datasets.yaml
+        comparator = generated_comparator['comparator']
+        result = generated_comparator['result']
         assert result['success'] is True
         
         # Check where datasets.yaml was saved
@@ -99,7 +112,7 @@ class TestPipelineIntegration:
         assert output_yaml.exists(), f"datasets.yaml should exist in {comparator.output_dir}"
         
         # Check if datasets.yaml exists in ROOT (where pipeline.py expects it)
-        root_yaml = Path.cwd() / "datasets.yaml"
+        root_yaml = ROOT / "datasets.yaml"
         
         # This will show the issue: pipeline.py expects the file in a different location
         if not root_yaml.exists():
@@ -107,8 +120,8 @@ class TestPipelineIntegration:
             print(f"   but pipeline.py expects it at {root_yaml}")
         
         # Verify the config has correct structure
-        with open(output_yaml, 'r') as f:
-            config = yaml.safe_load(f)
+        st = output_yaml.stat()
+        config = load_yaml(str(output_yaml.resolve()), st.st_mtime_ns, st.st_size)
         
         assert 'datasets' in config, "Config should have 'datasets' section"
         assert 'comparisons' in config, "Config should have 'comparisons' section"
@@ -128,10 +141,10 @@ class TestPipelineIntegration:
         )
         
         # Mock subprocess to simulate pipeline failure
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stderr = "FileNotFoundError: datasets.yaml not found"
-        mock_result.stdout = ""
+        mock_result = subprocess.CompletedProcess(
+            args=[], returncode=1, stdout="",
+            stderr="FileNotFoundError: datasets.yaml not found"
+        )
         
         with patch('subprocess.run', return_value=mock_result) as mock_run:
             result = comparator.run()
@@ -145,18 +158,10 @@ class TestPipelineIntegration:
             call_args = mock_run.call_args[0][0]
             assert 'pipeline.py' in call_args[1]
     
-    def test_pipeline_command_construction(self, sample_data_files):
+    def test_pipeline_command_construction(self, generated_comparator):
         """Test that the pipeline command is constructed correctly."""
-        comparator = DatasetComparator(
-            left_file=sample_data_files['left_file'],
-            right_file=sample_data_files['right_file'],
-            interactive=False,
-            run_pipeline=False,
-            verbose=False
-        )
-        
-        # Run to generate config
-        comparator.run()
+        # Config was generated once by the shared fixture
+        comparator = generated_comparator['comparator']
         
         # Check the command that would be constructed
         dataset_names = list(comparator.config['datasets'].keys())
@@ -169,31 +174,23 @@ class TestPipelineIntegration:
         # The issue: pipeline.py will look for datasets.yaml in ROOT, not output_dir
         # This test documents the expected vs actual behavior
         
-    def test_config_file_path_resolution(self, sample_data_files):
+    def test_config_file_path_resolution(self, generated_comparator):
         """Test that config file paths are resolved correctly."""
         # The current implementation saves to output_dir/datasets.yaml
         # But pipeline.py loads from ROOT/datasets.yaml
         # This is a critical architectural issue
         
-        comparator = DatasetComparator(
-            left_file=sample_data_files['left_file'],
-            right_file=sample_data_files['right_file'],
-            interactive=False,
-            run_pipeline=False,
-            verbose=False
-        )
-        
-        comparator.run()
+        comparator = generated_comparator['comparator']
         
         # Document the issue
         output_yaml = comparator.output_dir / "datasets.yaml"
-        root_yaml = Path.cwd() / "datasets.yaml"
+        root_yaml = ROOT / "datasets.yaml"
         
         assert output_yaml.exists()
         # This assertion would fail in production:
         # assert root_yaml.exists()  # Pipeline.py expects this
         
-    def test_silent_failure_scenario(self, sample_data_files):
+    def test_silent_failure_scenario(self, sample_data_files, capsys):
         """
         Test that demonstrates silent failure scenario.
         Pipeline appears to succeed but actually fails.
@@ -207,21 +204,19 @@ class TestPipelineIntegration:
         )
         
         # Mock subprocess to simulate silent failure
-        mock_result = Mock()
-        mock_result.returncode = 1
-        mock_result.stderr = ""  # Empty error message (silent failure)
-        mock_result.stdout = ""
+        mock_result = subprocess.CompletedProcess(
+            args=[], returncode=1, stdout="", stderr=""  # Empty error message (silent failure)
+        )
+        
+        with patch('subprocess.run', return_value=mock_result):
+            result = comparator.run()
+        
+        # The issue: even though pipeline failed, success message might be shown
+        # because result['config'] exists (line 606 in compare_datasets.py).
+        assert result['pipeline_success'] is False
+        printed = capsys.readouterr().out
+        assert "Pipeline execution: Success" not in printed
         
-        with patch('subprocess.run', return_value=mock_result) as mock_run:
-            with patch('builtins.print') as mock_print:
-                result = comparator.run()
-                
-                # Check if misleading success message was printed
-                print_calls = [str(call) for call in mock_print.call_args_list]
-                
-                # The issue: even though pipeline failed, success message might be shown
-                # because result['config'] exists (line 606 in compare_datasets.py)
-                
     def test_error_propagation_chain(self, sample_data_files):
         """Test that errors propagate correctly through the chain."""
         
@@ -248,19 +243,11 @@ class TestPipelineIntegration:
         config = generator.generate()
         assert 'comparisons' in config  # Must have comparisons section
         
-    def test_column_mapping_in_pipeline(self, sample_data_files):
+    def test_column_mapping_in_pipeline(self, generated_comparator):
         """Test that column mappings are correctly applied in pipeline."""
         
-        # Create a comparator and generate config
-        comparator = DatasetComparator(
-            left_file=sample_data_files['left_file'],
-            right_file=sample_data_files['right_file'],
-            interactive=False,
-            run_pipeline=False,
-            verbose=False
-        )
-        
-        result = comparator.run()
+        # Reuse the comparator and config generated by the shared fixture
+        comparator = generated_comparator['comparator']
         
         # Check column mappings in generated config
         config = comparator.config
@@ -7,19 +7,39 @@ import pytest
 import pandas as pd
 import duckdb
 import yaml
-import tempfile
 from pathlib import Path
-import sys
 
-sys.path.append(str(Path(__file__).parent.parent))
+from pipeline import stage_dataset, register_udfs
 
-from pipeline import stage_dataset, register_udfs, boolean_t_f_py
+
+def assert_columns_exist(con, table, cols):
+    """Assert that every name in ``cols`` is a column of ``table``."""
+    found = {r[0] for r in con.execute(
+        "SELECT column_name FROM duckdb_columns() WHERE table_name = ?", [table]
+    ).fetchall()}
+    missing = set(cols) - found
+    assert not missing, f"{table} is missing columns after mapping: {sorted(missing)}"
+
+
+def stage_csv(con, tmp_path, name, df, config):
+    """Write ``df`` to a CSV under ``tmp_path`` and stage it through the pipeline."""
+    csv_path = tmp_path / f"{name}.csv"
+    df.to_csv(csv_path, index=False)
+    stage_dataset(con, name, {**config, 'path': str(csv_path)})
 
 
 class TestPipelineRobustness:
     """Test suite for pipeline code robustness."""
     
-    def test_duckdb_column_name_transformation(self):
+    @pytest.fixture(scope="class")
+    def con(self):
+        """One in-memory connection with UDFs registered, shared by the class."""
+        c = duckdb.connect(':memory:')
+        register_udfs(c)
+        yield c
+        c.close()
+    
+    def test_duckdb_column_name_transformation(self, con, tmp_path):
         """Test that pipeline handles DuckDB's automatic column name transformations."""
         # Create test CSV with problematic column names
         test_data = pd.DataFrame({
@@ -29,51 +49,35 @@ class TestPipelineRobustness:
             'Normal Column': ['x', 'y', 'z']
         })
         
-        # Save to temp CSV
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
+        # Create config that expects the original names (with dots)
+        config = {
+            'keys': ['message_id', 'transaction_id'],
+            'column_map': {
+                'Internal ID': 'message_id',
+                'Internal ID.1': 'transaction_id',  # Original name with dot
+                'Column.With.Dots': 'dotted_column',
+                'Normal Column': 'normal_column'
+            },
+            'dtypes': {
+                'message_id': 'int64',
+                'transaction_id': 'int64',
+                'dotted_column': 'string',
+                'normal_column': 'string'
+            },
+            'normalizers': {}
+        }
         
-        try:
-            # Create config that expects the original names (with dots)
-            config = {
-                'path': temp_path,
-                'keys': ['message_id', 'transaction_id'],
-                'column_map': {
-                    'Internal ID': 'message_id',
-                    'Internal ID.1': 'transaction_id',  # Original name with dot
-                    'Column.With.Dots': 'dotted_column',
-                    'Normal Column': 'normal_column'
-                },
-                'dtypes': {
-                    'message_id': 'int64',
-                    'transaction_id': 'int64',
-                    'dotted_column': 'string',
-                    'normal_column': 'string'
-                },
-                'normalizers': {}
-            }
-            
-            # Stage the dataset - pipeline should handle the transformation
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            
-            # This should work even though DuckDB transforms the column names
-            stage_dataset(con, 'test_dataset', config)
-            
-            # Verify columns were renamed correctly
-            result = con.execute("SELECT * FROM test_dataset LIMIT 1").fetchall()
-            columns = [r[0] for r in con.execute("DESCRIBE test_dataset").fetchall()]
-            
-            assert 'message_id' in columns, "message_id should exist after mapping"
-            assert 'transaction_id' in columns, "transaction_id should exist after mapping"
-            assert 'dotted_column' in columns, "dotted_column should exist after mapping"
-            assert 'normal_column' in columns, "normal_column should exist after mapping"
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Stage the dataset - pipeline should handle the transformation
+        # This should work even though DuckDB transforms the column names
+        stage_csv(con, tmp_path, 'test_dataset', test_data, config)
+        
+        # Verify columns were renamed correctly
+        result = con.execute("SELECT * FROM test_dataset LIMIT 1").fetchall()
+        assert_columns_exist(con, 'test_dataset', [
+            'message_id', 'transaction_id', 'dotted_column', 'normal_column'
+        ])
     
-    def test_boolean_normalization_all_formats(self):
+    def test_boolean_normalization_all_formats(self, con):
         """Test that boolean normalization handles all common boolean representations."""
         test_cases = [
             ('true', 't'),
@@ -93,11 +97,19 @@ class TestPipelineRobustness:
             (None, None),     # Null handling
         ]
         
-        for input_val, expected in test_cases:
-            result = boolean_t_f_py(input_val)
+        # Apply the registered UDF to every case in one vectorized query
+        values = ", ".join(["(?, ?)"] * len(test_cases))
+        params = [v for case in test_cases for v in case]
+        rows = con.execute(
+            f"SELECT x, boolean_t_f(x), expected FROM (VALUES {values}) t(x, expected)",
+            params
+        ).fetchall()
+        
+        assert len(rows) == len(test_cases)
+        for input_val, result, expected in rows:
             assert result == expected, f"boolean_t_f({input_val}) should return {expected}, got {result}"
     
-    def test_boolean_fields_normalized_in_pipeline(self):
+    def test_boolean_fields_normalized_in_pipeline(self, con, tmp_path):
         """Test that boolean fields are properly normalized during staging."""
         # Create test data with various boolean formats
         test_data = pd.DataFrame({
@@ -106,48 +118,37 @@ class TestPipelineRobustness:
             'has_data': ['t', 'f', 'T', 'F', '0']
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
-        
-        try:
-            config = {
-                'path': temp_path,
-                'keys': ['id'],
-                'column_map': {},
-                'dtypes': {
-                    'id': 'int64',
-                    'is_active': 'boolean',
-                    'has_data': 'boolean'
-                },
-                'normalizers': {
-                    'is_active': ['boolean_t_f'],
-                    'has_data': ['boolean_t_f']
-                }
+        config = {
+            'keys': ['id'],
+            'column_map': {},
+            'dtypes': {
+                'id': 'int64',
+                'is_active': 'boolean',
+                'has_data': 'boolean'
+            },
+            'normalizers': {
+                'is_active': ['boolean_t_f'],
+                'has_data': ['boolean_t_f']
             }
-            
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            stage_dataset(con, 'test_booleans', config)
-            
-            # Check that all boolean values are normalized to 't' or 'f'
-            result = con.execute("SELECT is_active, has_data FROM test_booleans").fetchall()
-            
-            for row in result:
-                assert row[0] in ('t', 'f'), f"is_active should be 't' or 'f', got {row[0]}"
-                assert row[1] in ('t', 'f'), f"has_data should be 't' or 'f', got {row[1]}"
-            
-            # Verify specific normalizations
-            first_row = con.execute("SELECT is_active FROM test_booleans WHERE id = 1").fetchone()
-            assert first_row[0] == 't', "true should normalize to 't'"
-            
-            second_row = con.execute("SELECT is_active FROM test_booleans WHERE id = 2").fetchone()
-            assert second_row[0] == 'f', "false should normalize to 'f'"
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        }
+        
+        stage_csv(con, tmp_path, 'test_booleans', test_data, config)
+        
+        # Fetch everything once; ORDER BY id makes rows[i] the row with id i + 1
+        rows = con.execute(
+            "SELECT id, is_active, has_data FROM test_booleans ORDER BY id"
+        ).fetchall()
+        
+        # Check that all boolean values are normalized to 't' or 'f'
+        for row in rows:
+            assert row[1] in ('t', 'f'), f"is_active should be 't' or 'f', got {row[1]}"
+            assert row[2] in ('t', 'f'), f"has_data should be 't' or 'f', got {row[2]}"
+        
+        # Verify specific normalizations
+        assert rows[0][1] == 't', "true should normalize to 't'"
+        assert rows[1][1] == 'f', "false should normalize to 'f'"
     
-    def test_mixed_case_column_handling(self):
+    def test_mixed_case_column_handling(self, con, tmp_path):
         """Test that pipeline handles mixed case column names correctly."""
         test_data = pd.DataFrame({
             'Message_ID': [1, 2, 3],
@@ -155,48 +156,34 @@ class TestPipelineRobustness:
             'Email_Address': ['a@test.com', 'b@test.com', 'c@test.com']
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
-        
-        try:
-            config = {
-                'path': temp_path,
-                'keys': ['message_id', 'transaction_id'],
-                'column_map': {
-                    'Message_ID': 'message_id',
-                    'Transaction_Id': 'transaction_id',
-                    'Email_Address': 'email'
-                },
-                'dtypes': {
-                    'message_id': 'int64',
-                    'transaction_id': 'int64',
-                    'email': 'string'
-                },
-                'normalizers': {
-                    'email': ['unicode_clean', 'upper']
-                }
+        config = {
+            'keys': ['message_id', 'transaction_id'],
+            'column_map': {
+                'Message_ID': 'message_id',
+                'Transaction_Id': 'transaction_id',
+                'Email_Address': 'email'
+            },
+            'dtypes': {
+                'message_id': 'int64',
+                'transaction_id': 'int64',
+                'email': 'string'
+            },
+            'normalizers': {
+                'email': ['unicode_clean', 'upper']
             }
-            
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            stage_dataset(con, 'test_mixed_case', config)
-            
-            # Verify the mapping worked
-            columns = [r[0] for r in con.execute("DESCRIBE test_mixed_case").fetchall()]
-            assert 'message_id' in columns
-            assert 'transaction_id' in columns
-            assert 'email' in columns
-            
-            # Verify normalization was applied
-            emails = con.execute("SELECT email FROM test_mixed_case").fetchall()
-            for email in emails:
-                assert email[0].isupper(), f"Email should be uppercase: {email[0]}"
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        }
+        
+        stage_csv(con, tmp_path, 'test_mixed_case', test_data, config)
+        
+        # Verify the mapping worked
+        assert_columns_exist(con, 'test_mixed_case', ['message_id', 'transaction_id', 'email'])
+        
+        # Verify normalization was applied
+        emails = con.execute("SELECT email FROM test_mixed_case").fetchall()
+        for email in emails:
+            assert email[0].isupper(), f"Email should be uppercase: {email[0]}"
     
-    def test_special_characters_in_column_names(self):
+    def test_special_characters_in_column_names(self, con, tmp_path):
         """Test handling of special characters in column names."""
         test_data = pd.DataFrame({
             'Column (with parens)': [1, 2, 3],
@@ -205,28 +192,25 @@ class TestPipelineRobustness:
             'Column$with$dollars': [10, 11, 12]
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
+        temp_path = tmp_path / "in.csv"
+        temp_path.write_text(
+            ",".join(test_data.columns) + "\n"
+            "1,4,7,10\n"
+            "2,5,8,11\n"
+            "3,6,9,12\n"
+        )
         
-        try:
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            
-            # Read the CSV to see how DuckDB handles these names
-            con.execute(f"CREATE TABLE test_raw AS SELECT * FROM read_csv_auto('{temp_path}', header=TRUE, all_varchar=1)")
-            actual_columns = [r[0] for r in con.execute("DESCRIBE test_raw").fetchall()]
-            
-            print(f"Original columns: {list(test_data.columns)}")
-            print(f"DuckDB columns: {actual_columns}")
-            
-            # DuckDB should handle these gracefully
-            assert len(actual_columns) == 4, "All columns should be present"
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Read the CSV to see how DuckDB handles these names
+        con.execute(f"CREATE OR REPLACE TABLE test_raw AS SELECT * FROM read_csv_auto('{temp_path}', header=TRUE, all_varchar=1)")
+        actual_columns = [r[0] for r in con.execute("DESCRIBE test_raw").fetchall()]
+        
+        print(f"Original columns: {list(test_data.columns)}")
+        print(f"DuckDB columns: {actual_columns}")
+        
+        # DuckDB should handle these gracefully
+        assert len(actual_columns) == 4, "All columns should be present"
     
-    def test_key_validation_with_mapped_names(self):
+    def test_key_validation_with_mapped_names(self, con, tmp_path):
         """Test that the pipeline validates keys use mapped names correctly."""
         test_data = pd.DataFrame({
             'ID': [1, 2, 3],
@@ -234,43 +218,29 @@ class TestPipelineRobustness:
             'Value': ['a', 'b', 'c']
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
+        # Config uses mapped names for keys (correct approach)
+        config = {
+            'keys': ['message_id', 'transaction_id'],  # Using mapped names
+            'column_map': {
+                'ID': 'message_id',
+                'TransID': 'transaction_id',
+                'Value': 'value'
+            },
+            'dtypes': {
+                'message_id': 'int64',
+                'transaction_id': 'int64',
+                'value': 'string'
+            },
+            'normalizers': {}
+        }
         
-        try:
-            # Config uses mapped names for keys (correct approach)
-            config = {
-                'path': temp_path,
-                'keys': ['message_id', 'transaction_id'],  # Using mapped names
-                'column_map': {
-                    'ID': 'message_id',
-                    'TransID': 'transaction_id',
-                    'Value': 'value'
-                },
-                'dtypes': {
-                    'message_id': 'int64',
-                    'transaction_id': 'int64',
-                    'value': 'string'
-                },
-                'normalizers': {}
-            }
-            
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            
-            # This should work with the mapped key names
-            stage_dataset(con, 'test_keys', config)
-            
-            # Verify the keys are present
-            columns = [r[0] for r in con.execute("DESCRIBE test_keys").fetchall()]
-            assert 'message_id' in columns
-            assert 'transaction_id' in columns
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # This should work with the mapped key names
+        stage_csv(con, tmp_path, 'test_keys', test_data, config)
+        
+        # Verify the keys are present
+        assert_columns_exist(con, 'test_keys', ['message_id', 'transaction_id'])
     
-    def test_null_value_handling(self):
+    def test_null_value_handling(self, con, tmp_path):
         """Test that null values are handled correctly in normalization."""
         test_data = pd.DataFrame({
             'id': [1, 2, 3, 4],
@@ -278,43 +248,31 @@ class TestPipelineRobustness:
             'is_active': ['true', None, 'false', '']
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_path = f.name
-        
-        try:
-            config = {
-                'path': temp_path,
-                'keys': ['id'],
-                'column_map': {},
-                'dtypes': {
-                    'id': 'int64',
-                    'email': 'string',
-                    'is_active': 'boolean'
-                },
-                'normalizers': {
-                    'email': ['unicode_clean', 'upper'],
-                    'is_active': ['boolean_t_f']
-                }
+        config = {
+            'keys': ['id'],
+            'column_map': {},
+            'dtypes': {
+                'id': 'int64',
+                'email': 'string',
+                'is_active': 'boolean'
+            },
+            'normalizers': {
+                'email': ['unicode_clean', 'upper'],
+                'is_active': ['boolean_t_f']
             }
-            
-            con = duckdb.connect(':memory:')
-            register_udfs(con)
-            
-            # Should handle nulls without errors
-            stage_dataset(con, 'test_nulls', config)
-            
-            # Verify nulls are preserved
-            result = con.execute("SELECT id, email, is_active FROM test_nulls ORDER BY id").fetchall()
-            
-            # Row 2 should have null email
-            assert result[1][1] is None or result[1][1] == '', "Null email should be preserved"
-            
-            # Row 4 has empty string - normalizers should handle it
-            assert result[3][2] in ('', None, 'f'), "Empty string should be handled gracefully"
-            
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        }
+        
+        # Should handle nulls without errors
+        stage_csv(con, tmp_path, 'test_nulls', test_data, config)
+        
+        # Verify nulls are preserved
+        result = con.execute("SELECT id, email, is_active FROM test_nulls ORDER BY id").fetchall()
+        
+        # Row 2 should have null email
+        assert result[1][1] is None or result[1][1] == '', "Null email should be preserved"
+        
+        # Row 4 has empty string - normalizers should handle it
+        assert result[3][2] in ('', None, 'f'), "Empty string should be handled gracefully"
 
 
 if __name__ == "__main__":
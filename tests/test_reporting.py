@@ -1,83 +1,61 @@
-import os
-import stat
-import time
-import shutil
-import sys
+import html
+import re
+import zipfile
 from pathlib import Path
 
-import duckdb
-import pandas as pd
 import pytest
 
-# Add root to sys.path
 ROOT = Path(__file__).resolve().parent.parent
-sys.path.append(str(ROOT))
+
+# Writes to ROOT/data/reports and tears down ROOT/data/staging; keep on the
+# same xdist worker as the other tests that share those directories
+pytestmark = pytest.mark.xdist_group("io_heavy")
 
 # Import functions from pipeline
-from pipeline import (
-    stage_dataset,
-    compare_pair,
-    load_config,
-    register_udfs,
-)
-
-# ---------- helpers ----------
-
-def _rmtree_retry(path: Path, tries: int = 8, delay: float = 0.25) -> None:
-    """Robust rmtree for Windows/OneDrive locks."""
-    if not path.exists():
-        return
-
-    def _onerror(func, p, exc_info):
-        # try to make writable and retry the op
-        try:
-            os.chmod(p, stat.S_IWRITE)
-        except Exception:
-            pass
-        try:
-            func(p)
-        except PermissionError:
-            # let outer loop retry
-            raise
-
-    for _ in range(tries):
-        try:
-            shutil.rmtree(path, onerror=_onerror)
-            return
-        except PermissionError:
-            time.sleep(delay)
-    # last resort: best-effort without raising
-    shutil.rmtree(path, ignore_errors=True)
-
-# ---------- fixtures ----------
-
-@pytest.fixture(scope="module")
-def config():
-    """Fixture to load the main config file."""
-    return load_config()
-
-@pytest.fixture(scope="module")
-def staged_data(config):
-    """Stage once for all tests in this module."""
-    STAGING_DIR = ROOT / "data" / "staging"
-    REPORTS_DIR = ROOT / "data" / "reports"
-    STAGING_DIR.mkdir(parents=True, exist_ok=True)
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-
-    con = duckdb.connect(database=":memory:")
-    register_udfs(con)
-
-    # Stage all datasets from config
-    for name, cfg in config["datasets"].items():
-        stage_dataset(con, name, cfg)
-
-    # Yield the connection with staged data
-    yield con
-
-    # Teardown: close duckdb and clean folders with retry
-    con.close()
-    _rmtree_retry(STAGING_DIR)
-    _rmtree_retry(REPORTS_DIR)
+from pipeline import compare_pair
+
+# Read the generated report with calamine when it is installed; openpyxl otherwise
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+
+_SHEET_NAME_RE = re.compile(r'<sheet\b[^>]*\bname="([^"]*)"')
+
+
+def _sheet_names(report_path: Path):
+    """
+    Return the workbook's sheet names straight from ``xl/workbook.xml``.
+
+    An XLSX is a ZIP archive, so listing sheets needs no workbook parser.
+    """
+    with zipfile.ZipFile(report_path) as z:
+        workbook_xml = z.read("xl/workbook.xml").decode("utf-8")
+    return [html.unescape(name) for name in _SHEET_NAME_RE.findall(workbook_xml)]
+
+
+def _read_rows(report_path: Path, sheet: str):
+    """
+    Return the rows of one sheet as tuples.
+
+    Reads cells directly (calamine, or openpyxl in read-only streaming
+    mode) rather than building DataFrames.
+    """
+    if CALAMINE_AVAILABLE:
+        wb = CalamineWorkbook.from_path(str(report_path))
+        return [tuple(r) for r in wb.get_sheet_by_name(sheet).to_python()]
+
+    from openpyxl import load_workbook
+    wb = load_workbook(report_path, read_only=True)
+    try:
+        return list(wb[sheet].iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+# The ``config`` and ``staged_data`` fixtures are session-scoped in conftest.py
 
 # ---------- tests ----------
 
@@ -87,7 +65,7 @@ def test_excel_report_generation(staged_data, config):
     cmp_cfg = config["comparisons"][0]
     name = cmp_cfg["name"]
     compare_pair(
-        staged_data,
+        staged_data.cursor(),
         name,
         cmp_cfg["left"],
         cmp_cfg["right"],
@@ -100,22 +78,24 @@ def test_excel_report_generation(staged_data, config):
     report_path = ROOT / "data" / "reports" / f"{name}__detailed_report.xlsx"
     assert report_path.exists()
 
-    # Read all sheets via a context manager to ensure the file is closed
-    with pd.ExcelFile(report_path, engine="openpyxl") as xf:
-        sheet_names = set(xf.sheet_names)
-        expected_sheets = {
-            "Summary",
-            f"Only in {cmp_cfg['left']}",
-            f"Only in {cmp_cfg['right']}",
-            "Value Differences",
-            "Data_Lineage",
-        }
-        assert expected_sheets.issubset(sheet_names)
-
-        # Summary checks
-        summary_df = xf.parse("Summary")
-        summary_metrics = dict(zip(summary_df.Metric.astype(str), summary_df.Value))
-        assert summary_metrics["comparison"] == "invoices_vs_jobs"
-        assert int(summary_metrics["only_in_left"]) == 1
-        assert int(summary_metrics["only_in_right"]) == 1
-        assert int(summary_metrics["value_differences"]) == 3
+    sheet_names = _sheet_names(report_path)
+    expected_sheets = {
+        "Summary",
+        f"Only in {cmp_cfg['left']}",
+        f"Only in {cmp_cfg['right']}",
+        "Value Differences",
+        "Data_Lineage",
+    }
+    assert expected_sheets.issubset(sheet_names)
+
+    # Only parse cells once the sheet layout is known to be right
+    summary_rows = _read_rows(report_path, "Summary")
+
+    # Summary checks
+    header, *body = summary_rows
+    metric_idx, value_idx = header.index("Metric"), header.index("Value")
+    summary_metrics = {str(r[metric_idx]): r[value_idx] for r in body}
+    assert summary_metrics["comparison"] == "invoices_vs_jobs"
+    assert int(summary_metrics["only_in_left"]) == 1
+    assert int(summary_metrics["only_in_right"]) == 1
+    assert int(summary_metrics["value_differences"]) == 3
@@ -10,16 +10,53 @@ Following CLAUDE.md TDD Protocol: Write Tests → Commit → Code → Iterate 
 """
 
 import pytest
+import re
+from dataclasses import dataclass, field
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, call
-from pathlib import Path
-import sys
-
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
 
 from src.core.comparator import DataComparator, ComparisonResult
-from src.config.manager import ComparisonConfig
+
+# Classify mocked DuckDB queries: value-difference count vs. key-match count
+DIFF_RE = re.compile(r"count\(\*\).*?inner join.*?where", re.I | re.S)
+MATCH_RE = re.compile(r"count\(\*\).*?inner join", re.I | re.S)
+
+# Normalization functions the robust comparison SQL is expected to use
+NORM_TOKENS_RE = re.compile(r"trim\(|lower\(|try_cast\(|timestamp|regexp_replace\(", re.I)
+
+
+@dataclass(slots=True)
+class _Res:
+    """Minimal stand-in for a DuckDB result; the comparator only calls fetchone()."""
+    value: tuple
+    
+    def fetchone(self):
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class _FakeConfig:
+    """Plain stand-in for the ComparisonConfig fields the comparison SQL reads."""
+    comparison_keys: list = field(default_factory=list)
+    value_columns: list = field(default_factory=list)
+    tolerance: float = 0
+    max_differences: int = 1000
+
+
+# ROBUST LOGIC SHOULD FIND NO DIFFERENCES: the value differences query
+# returns 0; the matches query finds the 1 record matching on key.
+_DIFF_RES = _Res((0,))
+_MATCH_RES = _Res((1,))
+_DEFAULT_RES = _Res((0,))
+
+
+def _dispatch_execute(sql_query):
+    """Return the shared result for the kind of query being run."""
+    if DIFF_RE.search(sql_query):
+        return _DIFF_RES
+    if MATCH_RE.search(sql_query):
+        return _MATCH_RES
+    return _DEFAULT_RES
 
 
 class TestRobustComparisonLogic:
@@ -32,18 +69,17 @@ class TestRobustComparisonLogic:
     
     def setup_method(self):
         """Set up test fixtures with mock DuckDB connection."""
-        # Mock DuckDB connection
-        self.mock_con = Mock()
+        # Stub DuckDB connection: execute() dispatches on the query text
+        self.mock_con = SimpleNamespace(execute=_dispatch_execute)
         
         # Create DataComparator instance
         self.comparator = DataComparator(self.mock_con)
         
-        # Mock configuration for exact comparison (no tolerance)
-        self.mock_config = Mock(spec=ComparisonConfig)
-        self.mock_config.comparison_keys = ['id']
-        self.mock_config.value_columns = ['date_field', 'string_field']
-        self.mock_config.tolerance = 0  # Exact comparison to test string/date normalization
-        self.mock_config.max_differences = 1000
+        # Configuration for exact comparison (no tolerance) to test string/date normalization
+        self.mock_config = _FakeConfig(
+            comparison_keys=['id'],
+            value_columns=['date_field', 'string_field'],
+        )
         
         # Mock dataset configs (no column mapping for this test)
         self.comparator.left_dataset_config = None
@@ -70,164 +106,54 @@ class TestRobustComparisonLogic:
         - string_field: 'value a' (trimmed, lowercase)
         
         These are logically identical but current brittle comparison will detect differences.
-        """
-        # Mock execute responses for different SQL queries
-        def mock_execute_side_effect(sql_query):
-            """Side effect function to return different results based on SQL query."""
-            query_lower = sql_query.lower().strip()
-            
-            # Mock response object
-            mock_result = Mock()
-            
-            if "count(*)" in query_lower and "inner join" in query_lower and "where" in query_lower:
-                # This is the value differences query - ROBUST LOGIC SHOULD FIND NO DIFFERENCES
-                # After implementing robust normalization, this should return 0 differences
-                mock_result.fetchone.return_value = [0]  # 0 differences found (ROBUST LOGIC WORKING)
-            elif "count(*)" in query_lower and "inner join" in query_lower:
-                # This is the matches query - both records match on key
-                mock_result.fetchone.return_value = [1]  # 1 match found
-            else:
-                # Default response
-                mock_result.fetchone.return_value = [0]
-            
-            return mock_result
-        
-        # Configure mock to use the side effect
-        self.mock_con.execute.side_effect = mock_execute_side_effect
-    
-    def test_date_time_format_false_positive_current_brittle_logic(self):
-        """
-        Test that current brittle logic incorrectly identifies date format differences as actual differences.
-        
-        EXPECTED TO FAIL INITIALLY: This test should return difference count > 0 until robust 
-        date/time normalization is implemented in _find_value_differences.
         
-        Test Data:
-        - Left: '2024-01-01 00:00:00' (ISO datetime)
-        - Right: '1/1/2024' (US date format)  
-        - These represent the SAME date but different formats
+        Responses come from the module-level _dispatch_execute stub.
         """
-        # Arrange: Use value columns that will trigger the date comparison issue
-        value_columns = ['date_field']
-        key_columns = ['id']
-        
-        # Act: Call _find_value_differences with logically identical but formatted differently data
-        differences_count = self.comparator._find_value_differences(
-            left_table="test_left_table",
-            right_table="test_right_table",
-            key_columns=key_columns,
-            value_columns=value_columns,
-            config=self.mock_config
-        )
-        
-        # Assert: ROBUST LOGIC SHOULD WORK - returns 0 differences 
-        # After implementing robust normalization, this should return 0
-        
-        # PHASE 2 (After Fix Implementation): Robust logic should find no differences
-        assert differences_count == 0, (
-            "ROBUST LOGIC: Should recognize '2024-01-01 00:00:00' and '1/1/2024' "
-            "as the same date after normalization"
-        )
+        self.mock_con.execute = _dispatch_execute
     
-    def test_string_whitespace_case_false_positive_current_brittle_logic(self):
+    @pytest.mark.parametrize("value_columns, reason", [
+        pytest.param(
+            ['date_field'],
+            "Should recognize '2024-01-01 00:00:00' and '1/1/2024' "
+            "as the same date after normalization",
+            id="date_time_format",
+        ),
+        pytest.param(
+            ['string_field'],
+            "Should recognize ' VALUE A  ' and 'value a' "
+            "as the same value after trimming and case normalization",
+            id="string_whitespace_case",
+        ),
+        pytest.param(
+            ['date_field', 'string_field'],
+            "Should recognize all format variations as logically equivalent "
+            "after comprehensive normalization (dates, strings, whitespace, case)",
+            id="combined",
+        ),
+    ])
+    def test_false_positive_current_brittle_logic(self, value_columns, reason):
         """
-        Test that current brittle logic incorrectly identifies string format differences as actual differences.
+        Test that logically identical but differently formatted values are not reported as differences.
         
         EXPECTED TO FAIL INITIALLY: This test should return difference count > 0 until robust
-        string normalization is implemented in _find_value_differences.
+        date/time and string normalization is implemented in _find_value_differences.
         
-        Test Data:
-        - Left: ' VALUE A  ' (extra whitespace, uppercase)
-        - Right: 'value a' (trimmed, lowercase)
-        - These represent the SAME value but different formatting
+        Test Data (see _setup_mock_comparison_data):
+        - Date field: '2024-01-01 00:00:00' (ISO datetime) vs '1/1/2024' (US date format)
+        - String field: ' VALUE A  ' (extra whitespace, uppercase) vs 'value a' (trimmed, lowercase)
+        - The combined case checks both columns at once
         """
-        # Arrange: Use value columns that will trigger the string comparison issue
-        value_columns = ['string_field']
-        key_columns = ['id']
-        
-        # Update mock to simulate string comparison
-        def string_comparison_mock(sql_query):
-            mock_result = Mock()
-            query_lower = sql_query.lower()
-            
-            if "count(*)" in query_lower and "inner join" in query_lower and "where" in query_lower:
-                # Robust string comparison should find no differences
-                mock_result.fetchone.return_value = [0]  # 0 differences (ROBUST LOGIC WORKING)
-            elif "count(*)" in query_lower and "inner join" in query_lower:
-                # Matches found
-                mock_result.fetchone.return_value = [1]
-            else:
-                mock_result.fetchone.return_value = [0]
-            return mock_result
-        
-        self.mock_con.execute.side_effect = string_comparison_mock
-        
         # Act: Call _find_value_differences with logically identical but formatted differently data
-        differences_count = self.comparator._find_value_differences(
-            left_table="test_left_table",
-            right_table="test_right_table", 
-            key_columns=key_columns,
-            value_columns=value_columns,
-            config=self.mock_config
-        )
-        
-        # Assert: ROBUST LOGIC SHOULD WORK - returns 0 differences
-        # After implementing robust normalization, this should return 0
-        
-        # PHASE 2 (After Fix Implementation): Robust logic should find no differences
-        assert differences_count == 0, (
-            "ROBUST LOGIC: Should recognize ' VALUE A  ' and 'value a' "
-            "as the same value after trimming and case normalization"
-        )
-    
-    def test_combined_false_positives_current_brittle_logic(self):
-        """
-        Test that current brittle logic incorrectly identifies multiple format differences.
-        
-        EXPECTED TO FAIL INITIALLY: This test combines both date and string false positives
-        to verify the comprehensive nature of the brittle logic problem.
-        
-        Test Data combines both previous test scenarios:
-        - Date field differences: '2024-01-01 00:00:00' vs '1/1/2024'
-        - String field differences: ' VALUE A  ' vs 'value a'
-        """
-        # Arrange: Use both problematic value columns
-        value_columns = ['date_field', 'string_field']  
-        key_columns = ['id']
-        
-        # Update mock to simulate both date and string comparison issues
-        def combined_comparison_mock(sql_query):
-            mock_result = Mock()
-            query_lower = sql_query.lower()
-            
-            if "count(*)" in query_lower and "inner join" in query_lower and "where" in query_lower:
-                # Robust logic should find no differences in both columns
-                mock_result.fetchone.return_value = [0]  # 0 rows with differences (ROBUST LOGIC WORKING)
-            elif "count(*)" in query_lower and "inner join" in query_lower:
-                # Matches found
-                mock_result.fetchone.return_value = [1] 
-            else:
-                mock_result.fetchone.return_value = [0]
-            return mock_result
-        
-        self.mock_con.execute.side_effect = combined_comparison_mock
-        
-        # Act: Call _find_value_differences with multiple format difference types
         differences_count = self.comparator._find_value_differences(
             left_table="test_left_table",
             right_table="test_right_table",
-            key_columns=key_columns,
+            key_columns=['id'],
             value_columns=value_columns,
             config=self.mock_config
         )
         
-        # Assert: ROBUST LOGIC SHOULD WORK - returns 0 differences
-        
-        # PHASE 2 (After Fix Implementation): Robust logic should find no differences  
-        assert differences_count == 0, (
-            "ROBUST LOGIC: Should recognize all format variations as logically equivalent "
-            "after comprehensive normalization (dates, strings, whitespace, case)"
-        )
+        # PHASE 2 (After Fix Implementation): Robust logic should find no differences
+        assert differences_count == 0, f"ROBUST LOGIC: {reason}"
     
     def test_sql_generation_includes_normalization_functions(self):
         """
@@ -240,16 +166,15 @@ class TestRobustComparisonLogic:
         value_columns = ['date_field', 'string_field']
         key_columns = ['id']
         
-        # Capture the actual SQL being generated
+        # Capture the actual SQL being generated; only the first query is checked
         generated_sql_queries = []
         
         def capture_sql_mock(sql_query):
-            generated_sql_queries.append(sql_query)
-            mock_result = Mock()
-            mock_result.fetchone.return_value = [1]  # Simulate differences found
-            return mock_result
+            if not generated_sql_queries:
+                generated_sql_queries.append(sql_query)
+            return _MATCH_RES  # Simulate differences found
         
-        self.mock_con.execute.side_effect = capture_sql_mock
+        self.mock_con.execute = capture_sql_mock
         
         # Act: Call _find_value_differences to generate SQL
         self.comparator._find_value_differences(
@@ -263,14 +188,15 @@ class TestRobustComparisonLogic:
         # Assert: Check that generated SQL includes normalization functions
         assert len(generated_sql_queries) > 0, "SQL should have been generated"
         
-        main_sql = generated_sql_queries[0].lower()
+        main_sql = generated_sql_queries[0]
         
         # PHASE 2 (After Fix Implementation): Robust SQL should include normalization
-        # main_sql is already converted to lowercase above
-        has_trim_normalization = "trim(" in main_sql
-        has_lower_normalization = "lower(" in main_sql 
-        has_timestamp_normalization = "try_cast(" in main_sql and "timestamp" in main_sql
-        has_regexp_replace = "regexp_replace(" in main_sql
+        # One scan collects every normalization token present, case-folded
+        found = {token.lower() for token in NORM_TOKENS_RE.findall(main_sql)}
+        has_trim_normalization = "trim(" in found
+        has_lower_normalization = "lower(" in found
+        has_timestamp_normalization = "try_cast(" in found and "timestamp" in found
+        has_regexp_replace = "regexp_replace(" in found
         
         # SQL contains all the robust normalization we implemented
         
@@ -318,14 +244,11 @@ class TestRobustComparisonGeneralizable:
         value_columns = ['created_timestamp', 'customer_name', 'product_description']
         key_columns = ['order_id']
         
-        mock_config = Mock(spec=ComparisonConfig)
-        mock_config.tolerance = 0
-        mock_config.max_differences = 1000
+        mock_config = _FakeConfig()
         
-        # Mock response simulating no differences found by robust logic
-        mock_result = Mock()
-        mock_result.fetchone.return_value = [0]  # 0 differences found (robust logic working)
-        self.mock_con.execute.return_value = mock_result
+        # Response simulating no differences found by robust logic; the Mock
+        # connection stays so the generated SQL can be read from call_args
+        self.mock_con.execute.return_value = _Res((0,))  # 0 differences found (robust logic working)
         
         # Act
         differences_count = self.comparator._find_value_differences(
@@ -356,13 +279,10 @@ class TestRobustComparisonGeneralizable:
         
         Ensures the fix doesn't break when there are no differences or no matches.
         """
-        # Arrange: Mock scenario with no differences
-        mock_result = Mock()
-        mock_result.fetchone.return_value = [0]  # No differences
-        self.mock_con.execute.return_value = mock_result
+        # Arrange: Stub scenario with no differences
+        self.comparator.con = SimpleNamespace(execute=lambda sql_query: _Res((0,)))  # No differences
         
-        mock_config = Mock(spec=ComparisonConfig)
-        mock_config.tolerance = 0
+        mock_config = _FakeConfig()
         
         # Act
         differences_count = self.comparator._find_value_differences(
@@ -12,14 +12,8 @@ Following CLAUDE.md TDD Protocol: Write Tests → Commit → Code → Iterate 
 
 import pytest
 from unittest.mock import Mock, patch
-from pathlib import Path
-import sys
 import duckdb
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
-
 from src.core.comparator import DataComparator
 from src.config.manager import ComparisonConfig
 
@@ -33,25 +27,27 @@ class TestSQLSyntaxFix:
     Fixed implementation should use a safe quote stripping method.
     """
     
-    def setup_method(self):
-        """Set up test fixtures with real DuckDB connection for syntax validation."""
-        # Use real DuckDB connection to test actual SQL syntax
-        self.con = duckdb.connect(':memory:')
-        self.comparator = DataComparator(self.con)
+    @pytest.fixture(scope="class")
+    def syntax_env(self):
+        """
+        Real DuckDB connection and comparator shared by the whole class.
         
-        # Create test config for exact comparison (no tolerance)
-        self.config = ComparisonConfig(left_dataset="test_left", right_dataset="test_right")
-        self.config.tolerance = 0
+        The tables are created and filled once; no test writes to them, so
+        nothing needs resetting between tests.
+        """
+        # Use real DuckDB connection to test actual SQL syntax
+        con = duckdb.connect(':memory:')
+        comparator = DataComparator(con)
         
         # Create minimal test tables
-        self.con.execute("""
+        con.execute("""
             CREATE TABLE test_left (
                 id INTEGER,
                 text_col VARCHAR
             )
         """)
         
-        self.con.execute("""
+        con.execute("""
             CREATE TABLE test_right (
                 id INTEGER,
                 text_col VARCHAR
@@ -59,23 +55,32 @@ class TestSQLSyntaxFix:
         """)
         
         # Insert test data with quoted strings
-        self.con.execute("""
+        con.execute("""
             INSERT INTO test_left VALUES 
                 (1, '''System'''),
                 (2, '"Data"'),
                 (3, 'Normal')
         """)
         
-        self.con.execute("""
+        con.execute("""
             INSERT INTO test_right VALUES 
                 (1, 'System'),
                 (2, 'Data'),
                 (3, 'Normal')
         """)
+        
+        yield con, comparator
+        
+        con.close()
     
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        self.con.close()
+    @pytest.fixture(autouse=True)
+    def _bind_env(self, syntax_env):
+        """Expose the shared connection and comparator on each test instance."""
+        self.con, self.comparator = syntax_env
+        
+        # Create test config for exact comparison (no tolerance)
+        self.config = ComparisonConfig(left_dataset="test_left", right_dataset="test_right")
+        self.config.tolerance = 0
     
     def test_current_regex_pattern_causes_parser_error(self):
         """
@@ -185,23 +190,24 @@ class TestSQLSyntaxFix:
         This shows how to safely remove both single and double quotes
         from the beginning and end of strings without regex syntax issues.
         """
-        test_cases = [
-            ('"System"', 'system'),
-            ("'Data'", 'data'),
-            ('Normal', 'normal'),
-            ('""Double""', 'double'),
-            ("''Single''", 'single'),
-            ('"Mixed"', 'mixed'),
-        ]
+        expected = {
+            '"System"': 'system',
+            "'Data'": 'data',
+            'Normal': 'normal',
+            '""Double""': 'double',
+            "''Single''": 'single',
+            '"Mixed"': 'mixed',
+        }
         
-        # Safe quote stripping using nested LTRIM/RTRIM calls
+        # Safe quote stripping using nested LTRIM/RTRIM calls, evaluated over
+        # every case in one query
         safe_sql = """
-            SELECT TRIM(
+            SELECT input, TRIM(
                 LOWER(
                     RTRIM(
                         LTRIM(
                             RTRIM(
-                                LTRIM(?, ''''), 
+                                LTRIM(input, ''''), 
                                 ''''
                             ), 
                             '"'
@@ -210,15 +216,15 @@ class TestSQLSyntaxFix:
                     )
                 )
             ) AS result
+            FROM (VALUES ('"System"'), ('''Data'''), ('Normal'), ('""Double""'),
+                         ('''''Single'''''), ('"Mixed"')) t(input)
         """
         
-        for input_str, expected in test_cases:
-            result = self.con.execute(safe_sql, [input_str]).fetchone()
-            actual = result[0] if result else None
-            
-            assert actual == expected, (
-                f"Safe quote stripping failed: '{input_str}' -> expected '{expected}', got '{actual}'"
-            )
+        actual = dict(self.con.execute(safe_sql).fetchall())
+        
+        assert actual == expected, (
+            f"Safe quote stripping failed: expected {expected}, got {actual}"
+        )
     
     def test_current_implementation_vs_safe_implementation(self):
         """
@@ -10,7 +10,7 @@ import pytest
 from unittest.mock import Mock, patch
 import duckdb
 
-from src.utils.normalizers import strip_hierarchy
+from src.utils.normalizers import strip_hierarchy, _strip_hierarchy_str
 from src.config.manager import DatasetConfig
 
 
@@ -36,107 +36,70 @@ class TestStripHierarchyNormalizer:
         (" : Final Part ", "Final Part"),  # Whitespace handling
     ]
     
-    def test_strip_hierarchy_basic_functionality(self):
-        """
-        Test the core hierarchy stripping logic.
-        
-        Validates the primary use case from the data report:
-        "100 - Operations : 110 Operations" should become "110 Operations"
-        """
-        input_value = "100 - Operations : 110 Operations"
-        expected_output = "110 Operations"
-        
-        result = strip_hierarchy(input_value)
-        
-        assert result == expected_output, (
-            f"Expected '{expected_output}', got '{result}' for input '{input_value}'"
-        )
-    
-    def test_strip_hierarchy_construction_example(self):
-        """
-        Test the construction department example from the data report.
-        
-        Validates the specific case: "400 - Construction : 410 CTO" → "410 CTO"
-        """
-        input_value = "400 - Construction : 410 CTO"
-        expected_output = "410 CTO"
-        
-        result = strip_hierarchy(input_value)
-        
-        assert result == expected_output, (
-            f"Expected '{expected_output}', got '{result}' for input '{input_value}'"
-        )
+    # Further cases: deep hierarchies, malformed and non-string input,
+    # realistic ERP export patterns, and values with no hierarchy at all
+    other_cases = [
+        # Deep hierarchies
+        ("400 - Construction : 420 - Construction Indirect : 421 Specific", "421 Specific"),
+        ("Level1 : Level2 : Level3 : Final Component", "Final Component"),
+        ("A : B : C : D : E", "E"),
+        
+        # Edge cases and malformed data
+        ("Simple Name", "Simple Name"),
+        (":", ""),
+        ("Start :: : End", "End"),
+        ("Parent :   ", ""),
+        (": Only Child", "Only Child"),
+        
+        # Non-string input is returned unchanged
+        (None, None),
+        (123, 123),
+        ([1, 2, 3], [1, 2, 3]),
+        
+        # NetSuite-style department hierarchies
+        ("200 - Sales : 210 - Inside Sales : 211 Inbound", "211 Inbound"),
+        ("300 - Engineering : 310 - Software : 311 Backend", "311 Backend"),
+        ("HR : Human Resources : Recruiting", "Recruiting"),
+        ("Finance:Accounting:AP", "AP"),  # No spaces around colons
+        ("Legal : : Compliance", "Compliance"),  # Empty middle section
+        ("001 - Admin : 002 - IT : 003-Support", "003-Support"),
+        ("Dept-A : Sub-Dept-B : Team-C-2024", "Team-C-2024"),
+        
+        # Non-hierarchical values are preserved unchanged
+        ("Operations", "Operations"),
+        ("Human Resources", "Human Resources"),
+        ("Finance & Accounting", "Finance & Accounting"),
+        ("IT Support", "IT Support"),
+        ("Sales Team", "Sales Team"),
+        ("Executive Leadership", "Executive Leadership"),
+        ("R&D Department", "R&D Department"),
+        ("Customer Service", "Customer Service"),
+        ("Marketing Communications", "Marketing Communications"),
+        ("  Padded Name  ", "  Padded Name  "),
+    ]
     
-    def test_strip_hierarchy_multiple_levels(self):
-        """
-        Test handling of deep hierarchical structures.
-        
-        Validates that the function correctly extracts the final component
-        from multi-level hierarchies with multiple colon delimiters.
-        """
-        test_cases = [
-            ("400 - Construction : 420 - Construction Indirect : 421 Specific", "421 Specific"),
-            ("Level1 : Level2 : Level3 : Final Component", "Final Component"),
-            ("A : B : C : D : E", "E"),
-        ]
-        
-        for input_value, expected_output in test_cases:
-            result = strip_hierarchy(input_value)
-            assert result == expected_output, (
-                f"Expected '{expected_output}', got '{result}' for input '{input_value}'"
-            )
+    # Every scalar case once, keyed by input
+    all_cases = list({repr(value): (value, expected)
+                      for value, expected in test_data_hierarchy + other_cases}.values())
     
-    def test_strip_hierarchy_edge_cases(self):
+    @pytest.mark.parametrize("input_value,expected_output", all_cases,
+                             ids=[repr(value) for value, _ in all_cases])
+    def test_strip_hierarchy_cases(self, input_value, expected_output):
         """
-        Test edge cases and boundary conditions.
+        Check strip_hierarchy against every known input.
         
-        Validates proper handling of:
-        - Non-hierarchical strings (no colon)
-        - Empty strings and whitespace
-        - Non-string input types
-        - Malformed hierarchical data
-        """
-        # Test non-hierarchical string (no colon)
-        assert strip_hierarchy("Simple Name") == "Simple Name"
-        
-        # Test empty string after colon
-        assert strip_hierarchy("Name : ") == ""
-        
-        # Test whitespace handling
-        assert strip_hierarchy(" : Final Part ") == "Final Part"
-        
-        # Test empty string
-        assert strip_hierarchy("") == ""
-        
-        # Test single colon
-        assert strip_hierarchy(":") == ""
-        
-        # Test multiple consecutive colons
-        assert strip_hierarchy("Start :: : End") == "End"
-        
-        # Test non-string input (should return unchanged)
-        assert strip_hierarchy(None) == None
-        assert strip_hierarchy(123) == 123
-        assert strip_hierarchy([1, 2, 3]) == [1, 2, 3]
-        
-        # Test with only whitespace after colon
-        assert strip_hierarchy("Parent :   ") == ""
-        
-        # Test with colon at the beginning
-        assert strip_hierarchy(": Only Child") == "Only Child"
-    
-    @pytest.mark.parametrize("input_value,expected_output", test_data_hierarchy)
-    def test_strip_hierarchy_with_test_data(self, input_value, expected_output):
-        """
-        Parameterized test using the test_data_hierarchy structure.
-        
-        Runs the strip_hierarchy function against all test cases defined
-        in the test_data_hierarchy list to ensure comprehensive coverage.
+        Hierarchical strings keep only their final component, trimmed;
+        anything without a colon (including non-strings) comes back as the
+        very same object.
         """
         result = strip_hierarchy(input_value)
         assert result == expected_output, (
             f"Expected '{expected_output}', got '{result}' for input '{input_value}'"
         )
+        if not isinstance(input_value, str) or ":" not in input_value:
+            assert result is input_value, (
+                f"Non-hierarchical value should be preserved unchanged: '{input_value}'"
+            )
     
     def test_strip_hierarchy_with_config_integration(self):
         """
@@ -182,62 +145,6 @@ class TestStripHierarchyNormalizer:
                 f"Integration test failed: expected '{expected}', got '{result}'"
             )
     
-    def test_strip_hierarchy_realistic_data_patterns(self):
-        """
-        Test with realistic data patterns found in business systems.
-        
-        Validates the normalizer works correctly with actual patterns that
-        might be found in NetSuite or similar ERP systems.
-        """
-        realistic_patterns = [
-            # NetSuite-style department hierarchies
-            ("100 - Operations : 110 Operations", "110 Operations"),
-            ("200 - Sales : 210 - Inside Sales : 211 Inbound", "211 Inbound"),
-            ("300 - Engineering : 310 - Software : 311 Backend", "311 Backend"),
-            
-            # Different formatting variations
-            ("HR : Human Resources : Recruiting", "Recruiting"), 
-            ("Finance:Accounting:AP", "AP"),  # No spaces around colons
-            ("Legal : : Compliance", "Compliance"),  # Empty middle section
-            
-            # Edge cases with numbers and special characters
-            ("001 - Admin : 002 - IT : 003-Support", "003-Support"),
-            ("Dept-A : Sub-Dept-B : Team-C-2024", "Team-C-2024"),
-        ]
-        
-        for input_val, expected_output in realistic_patterns:
-            result = strip_hierarchy(input_val)
-            assert result == expected_output, (
-                f"Realistic pattern test failed for '{input_val}': "
-                f"expected '{expected_output}', got '{result}'"
-            )
-    
-    def test_strip_hierarchy_preserves_original_for_non_hierarchical(self):
-        """
-        Test that non-hierarchical values are preserved unchanged.
-        
-        Ensures that department names without hierarchy markers are not
-        modified, preventing data corruption for simple department names.
-        """
-        non_hierarchical_values = [
-            "Operations",
-            "Human Resources", 
-            "Finance & Accounting",
-            "IT Support",
-            "Sales Team",
-            "Executive Leadership",
-            "R&D Department",
-            "Customer Service",
-            "Marketing Communications"
-        ]
-        
-        for value in non_hierarchical_values:
-            result = strip_hierarchy(value)
-            assert result == value, (
-                f"Non-hierarchical value should be preserved unchanged: "
-                f"'{value}' became '{result}'"
-            )
-    
     def test_strip_hierarchy_consistency(self):
         """
         Test that the function produces consistent results.
@@ -257,6 +164,21 @@ class TestStripHierarchyNormalizer:
         
         # Verify the expected result
         assert results[0] == "110 Operations"
+    
+    def test_strip_hierarchy_repeated_values_hit_cache(self):
+        """
+        Repeated hierarchy strings are served from the cache, with unchanged results.
+        """
+        _strip_hierarchy_str.cache_clear()
+        inputs = [value for value, _ in self.test_data_hierarchy]
+        
+        first = [strip_hierarchy(v) for v in inputs]
+        second = [strip_hierarchy(v) for v in inputs]
+        
+        assert first == second == [expected for _, expected in self.test_data_hierarchy]
+        # Values without a colon return early and never reach the cache
+        hierarchical = [v for v in inputs if ":" in v]
+        assert _strip_hierarchy_str.cache_info().hits >= len(hierarchical)
 
 
 if __name__ == "__main__":
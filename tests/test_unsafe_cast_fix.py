@@ -227,6 +227,13 @@ class TestUnsafeCastFix:
             "2023/06/15 3:45:22 PM",  # Mixed slashes and PM
         ]
         
+        # The condition depends only on the columns and config, so build it once
+        condition_sql = self.comparator._build_robust_comparison_condition(
+            norm_col="datetime_string", 
+            norm_right_col="datetime_string", 
+            config=self.config
+        )
+        
         for format_string in problematic_formats:
             # Create minimal test with just this format
             self.con.execute("DELETE FROM table_unsafe_left")
@@ -240,12 +247,6 @@ class TestUnsafeCastFix:
             """)
             
             # Test the comparison with this specific format
-            condition_sql = self.comparator._build_robust_comparison_condition(
-                norm_col="datetime_string", 
-                norm_right_col="datetime_string", 
-                config=self.config
-            )
-            
             test_sql = f"""
                 SELECT COUNT(*) FROM table_unsafe_left l
                 INNER JOIN table_unsafe_right r ON l.id = r.id
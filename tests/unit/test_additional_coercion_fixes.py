@@ -243,11 +243,13 @@ class TestAdditionalCoercionFixes:
             )
         """)
         
-        # Insert data using parameterized queries to avoid quote escaping issues
-        con.execute("INSERT INTO quote_test VALUES (?, ?, ?)", (1, "'-System-", "-System-"))
-        con.execute("INSERT INTO quote_test VALUES (?, ?, ?)", (2, '"Value"', "Value"))
-        con.execute("INSERT INTO quote_test VALUES (?, ?, ?)", (3, "O'Brien", "O'Brien"))
-        con.execute("INSERT INTO quote_test VALUES (?, ?, ?)", (4, "Normal", "Normal"))
+        # Insert data in one parameterized batch to avoid quote escaping issues
+        con.executemany("INSERT INTO quote_test VALUES (?, ?, ?)", [
+            (1, "'-System-", "-System-"),
+            (2, '"Value"', "Value"),
+            (3, "O'Brien", "O'Brien"),
+            (4, "Normal", "Normal"),
+        ])
         
         config = ComparisonConfig(
             left_dataset="test_left",
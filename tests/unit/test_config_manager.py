@@ -0,0 +1,129 @@
+"""
+Unit tests for ConfigManager YAML loading.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.config.cache import load_yaml
+from src.config.manager import ConfigManager
+
+
+CONFIG_YAML = """
+datasets:
+  left:
+    path: left.csv
+    key_columns: [id]
+  right:
+    path: right.csv
+    key_columns: [id]
+comparisons:
+  - left: left
+    right: right
+    keys: [id]
+"""
+
+
+class TestConfigManagerLoadCache:
+    """Test that repeated loads of an unchanged config skip re-parsing."""
+
+    def setup_method(self):
+        """Start each test with an empty parse cache."""
+        load_yaml.cache_clear()
+
+    def test_unchanged_file_is_parsed_once(self, tmp_path):
+        """Second load of the same file is served from the cache."""
+        config_path = tmp_path / "datasets.yaml"
+        config_path.write_text(CONFIG_YAML)
+
+        first = ConfigManager(config_path).load()
+        second = ConfigManager(config_path).load()
+
+        assert first == second
+        assert load_yaml.cache_info().hits == 1
+        assert load_yaml.cache_info().misses == 1
+
+    def test_loaded_config_is_independent_of_cache(self, tmp_path):
+        """Mutating one loaded config must not leak into the next load."""
+        config_path = tmp_path / "datasets.yaml"
+        config_path.write_text(CONFIG_YAML)
+
+        first = ConfigManager(config_path).load()
+        first["datasets"]["left"]["path"] = "mutated.csv"
+
+        second = ConfigManager(config_path).load()
+        assert second["datasets"]["left"]["path"] == "left.csv"
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Changing the file invalidates the cached parse."""
+        config_path = tmp_path / "datasets.yaml"
+        config_path.write_text(CONFIG_YAML)
+        ConfigManager(config_path).load()
+
+        config_path.write_text(CONFIG_YAML.replace("left.csv", "left_v2.csv"))
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        manager = ConfigManager(config_path)
+        manager.load()
+
+        assert manager.datasets["left"].path == "left_v2.csv"
+        assert load_yaml.cache_info().misses == 2
+
+
+class TestConfigManagerSaveGuard:
+    """Test that saving an unchanged config skips the YAML dump."""
+
+    def setup_method(self):
+        """Start each test with an empty in-process parse cache."""
+        load_yaml.cache_clear()
+
+    def _loaded_manager(self, tmp_path):
+        """Load CONFIG_YAML into a ConfigManager."""
+        config_path = tmp_path / "datasets.yaml"
+        config_path.write_text(CONFIG_YAML)
+        manager = ConfigManager(config_path)
+        manager.load()
+        return manager
+
+    def test_second_save_of_same_config_is_skipped(self, tmp_path):
+        """Re-saving identical content does not dump YAML again."""
+        manager = self._loaded_manager(tmp_path)
+        out_path = tmp_path / "saved.yaml"
+        manager.save(out_path)
+
+        with patch("src.config.manager.yaml.dump") as mock_dump:
+            manager.save(out_path)
+
+        mock_dump.assert_not_called()
+        # Nothing but the config itself is written next to it
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["datasets.yaml", "saved.yaml"]
+
+    def test_changed_config_is_written(self, tmp_path):
+        """A modified config is always written."""
+        manager = self._loaded_manager(tmp_path)
+        out_path = tmp_path / "saved.yaml"
+        manager.save(out_path)
+
+        manager.datasets["left"].path = "other.csv"
+        manager.save(out_path)
+
+        assert "other.csv" in out_path.read_text()
+
+    def test_hand_edited_file_is_rewritten(self, tmp_path):
+        """Edits made to the file after saving are overwritten on the next save."""
+        manager = self._loaded_manager(tmp_path)
+        out_path = tmp_path / "saved.yaml"
+        manager.save(out_path)
+        expected = out_path.read_text()
+
+        out_path.write_text("datasets: {}\n")
+        manager.save(out_path)
+
+        assert out_path.read_text() == expected
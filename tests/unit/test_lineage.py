@@ -0,0 +1,46 @@
+"""
+Unit tests for DataLineageTracker report output.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+import numpy as np
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.lineage import DataLineageTracker
+
+
+REPORT = {
+    "pipeline_metadata": {"start_time": datetime(2024, 1, 2, 3, 4, 5)},
+    "datasets": {"left": {"row_count_original": np.int64(3), "rows": 3,
+                          "match_rate": np.float64(1.5), "tolerance": float("nan")}},
+    "counts": {1: "one"},
+    "notes": "Café",
+}
+
+
+class TestSaveLineageReport:
+    """Test the on-disk format of saved lineage reports."""
+
+    def test_report_format(self, tmp_path):
+        """Datetimes, numpy scalars, NaN, int keys and non-ASCII text keep the json.dump format."""
+        tracker = DataLineageTracker()
+        with patch.object(tracker, "generate_lineage_report", return_value=REPORT):
+            path = tracker.save_lineage_report(tmp_path / "lineage.json")
+
+        text = path.read_text()
+        report = json.loads(text)
+
+        assert report["pipeline_metadata"]["start_time"] == "2024-01-02 03:04:05"
+        assert report["datasets"]["left"]["row_count_original"] == "3"
+        assert report["datasets"]["left"]["match_rate"] == 1.5
+        assert '"tolerance": NaN' in text
+        assert report["counts"] == {"1": "one"}
+        assert '"Caf\\u00e9"' in text
@@ -0,0 +1,44 @@
+"""
+Unit tests for the data validators.
+"""
+
+from pathlib import Path
+import sys
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.pipeline.validators import SchemaValidator
+
+
+class TestSchemaValidatorMixedTypes:
+    """Test the mixed-type check in SchemaValidator."""
+
+    def test_mixed_types_reported(self):
+        """An object column holding ints and strings produces a warning."""
+        df = pd.DataFrame({'value': pd.Series([1, 'two', 3.0, None], dtype=object)})
+
+        report = SchemaValidator().validate(df)
+
+        warnings = report.get_warnings()
+        assert len(warnings) == 1
+        assert set(warnings[0].details['types']) == {'int', 'str', 'float'}
+
+    def test_rare_type_in_large_column_reported(self):
+        """A single stray value is found however large the column is."""
+        df = pd.DataFrame({'value': pd.Series(['x'] * 50_000 + [1], dtype=object)})
+
+        report = SchemaValidator().validate(df)
+
+        warnings = report.get_warnings()
+        assert len(warnings) == 1
+        assert set(warnings[0].details['types']) == {'str', 'int'}
+
+    def test_string_column_not_reported(self):
+        """An object column of strings only is not flagged."""
+        df = pd.DataFrame({'value': pd.Series(['x', 'y', None], dtype=object)})
+
+        assert SchemaValidator().validate(df).get_warnings() == []